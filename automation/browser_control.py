@@ -19,13 +19,100 @@ For your friend's app:
     its action buttons.
 """
 
-from typing import Literal
+from typing import Callable, Literal
 
 # Keep this alias aligned with main.Action for clarity.
 Action = Literal["fold", "call", "raise"]
 
+# Any visible action button means it is the hero's turn to act.
+ACTION_BAR_SELECTOR = "#fold, #call, #raise"
 
-def click_action_playwright(
+# Name of the Python callback exposed to the page by install_turn_observer.
+TURN_BINDING_NAME = "onActionTurn"
+
+# Calls the binding whenever the DOM changes while an action button is
+# visible. Bursts of mutations are coalesced into one call per task tick.
+_TURN_OBSERVER_JS = """
+(() => {
+  if (window.__pokerTurnObserver) return;
+  window.__pokerTurnObserver = true;
+  let pending = false;
+  const notify = () => {
+    pending = false;
+    const button = document.querySelector("%(selector)s");
+    if (button && button.offsetParent !== null) window.%(binding)s();
+  };
+  const schedule = () => {
+    if (!pending) { pending = true; setTimeout(notify, 0); }
+  };
+  const start = () => {
+    new MutationObserver(schedule).observe(document.body, {subtree: true, childList: true, attributes: true});
+    schedule();
+  };
+  if (document.body) start(); else document.addEventListener("DOMContentLoaded", start);
+})();
+""" % {"selector": ACTION_BAR_SELECTOR, "binding": TURN_BINDING_NAME}
+
+# Fail fast when a button is missing rather than stalling the loop.
+CLICK_TIMEOUT_MS = 800
+
+# action -> (button id, button text)
+_ACTION_TABLE = {
+    "fold": ("fold", "Fold"),
+    "call": ("call", "Call"),
+    "raise": ("raise", "Raise"),
+}
+
+
+async def wait_for_action_bar(page, timeout: int = 1000) -> bool:
+    """
+    Wait until the action bar is visible, i.e. it is our turn to act.
+
+    Parameters:
+      page    - Playwright page object (async API)
+      timeout - maximum wait in milliseconds
+
+    Returns True as soon as any action button is visible, False if the
+    timeout expires first. This replaces fixed sleeps: the caller proceeds
+    the moment the UI is ready instead of after a hard-coded delay.
+    """
+    try:
+        await page.wait_for_selector(ACTION_BAR_SELECTOR, state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def install_turn_observer(page, on_turn: Callable[[], None]) -> None:
+    """
+    Push "it's our turn" notifications from the page instead of polling.
+
+    Exposes on_turn to the page and installs a MutationObserver that calls
+    it whenever the DOM changes while an action button is visible. The
+    observer is registered as an init script (survives navigation) and in
+    the current document. on_turn runs on the Playwright event loop, so it
+    should be cheap, e.g. asyncio.Event.set.
+    """
+    await page.expose_binding(TURN_BINDING_NAME, lambda source: on_turn())
+    await page.add_init_script(_TURN_OBSERVER_JS)
+    await page.evaluate(_TURN_OBSERVER_JS)
+
+
+def _action_locator(page, button_id: str, button_text: str):
+    """
+    Build one locator that matches the button by id or by its exact text.
+
+    Playwright resolves both alternatives of the selector list in a single
+    query, so the text fallback costs no extra round-trip or timeout.
+    Matches come back in DOM order, not selector order, so ``.first`` is
+    the earliest match on the page; the text alternative is limited to
+    buttons and the id to visible elements so a stray label or hidden
+    template cannot win over the real control.
+    """
+    return page.locator(f"#{button_id}:visible, button:text-is('{button_text}')").first
+
+
+async def click_action_playwright(
     page,
     action: Action,
 ) -> None:
@@ -33,45 +120,27 @@ def click_action_playwright(
     Click the appropriate action button in the browser using Playwright.
 
     Parameters:
-      page   - Playwright page object
+      page   - Playwright page object (async API)
       action - one of "fold", "call", "raise"
 
     Strategy:
-      1. Try to click by id (for the simulator).
-      2. If that fails, fall back to a text-based locator.
-      3. If everything fails, raise a RuntimeError so it is obvious.
+      1. Match the button by id (for the simulator) or by exact text,
+         both in one compound locator.
+      2. If nothing is clickable within CLICK_TIMEOUT_MS, raise a
+         RuntimeError so it is obvious.
 
     TODO:
-      When targeting a real app, update the selectors below to use
+      When targeting a real app, update _ACTION_TABLE to use
       that app's actual markup (ids, classes, data attributes, etc.).
     """
     action_lower = action.lower()
-
-    if action_lower not in {"fold", "call", "raise"}:
+    entry = _ACTION_TABLE.get(action_lower)
+    if entry is None:
         raise ValueError(f"Unknown action: {action}")
 
-    # Helper to try CSS, then text.
-    def try_click_by_id_or_text(button_id: str, button_text: str) -> bool:
-        try:
-            page.click(f"#{button_id}", timeout=2000)
-            return True
-        except Exception:
-            pass
-        try:
-            page.get_by_text(button_text, exact=True).click(timeout=2000)
-            return True
-        except Exception:
-            return False
-
-    if action_lower == "fold":
-        if try_click_by_id_or_text("fold", "Fold"):
-            return
-    elif action_lower == "call":
-        if try_click_by_id_or_text("call", "Call"):
-            return
-    elif action_lower == "raise":
-        if try_click_by_id_or_text("raise", "Raise"):
-            return
-
-    # If we reach this point, we could not find the button.
-    raise RuntimeError(f"Could not locate UI element for action '{action_lower}'")
+    locator = _action_locator(page, *entry)
+
+    try:
+        await locator.click(timeout=CLICK_TIMEOUT_MS)
+    except Exception as exc:
+        raise RuntimeError(f"Could not locate UI element for action '{action_lower}'") from exc
@@ -7,19 +7,20 @@ Pipeline:
     Screenshot -> Parse State -> Query Solver -> Execute Action
 """
 
+import asyncio
 import logging
-import time
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
 
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
 except ImportError:  # pragma: no cover - optional dependency for tests
-    sync_playwright = None  # type: ignore
+    async_playwright = None  # type: ignore
 
 from vision import capture
 from solver import lookup, decision
+from solver.batching import BatchingSolverClient
 from automation import browser_control
 
 # Type alias for the three basic actions we support
@@ -27,7 +28,14 @@ Action = Literal["fold", "call", "raise"]
 
 # Simple configuration block
 TABLE_URL = "http://localhost:8000"  # TODO: replace with your real app URL
-LOOP_DELAY_SECONDS = 1.0             # throttle between actions
+TABLE_URLS = [TABLE_URL]             # one page per entry; repeat to multi-table
+MAX_CONCURRENT_STEPS = 5             # decision steps in flight across pages
+SOLVER_BATCH_SIZE = 32               # max states per bulk solver query
+SOLVER_FLUSH_MS = 50                 # max wait to fill a batch (multi-table only)
+TURN_TIMEOUT_MS = 1000               # max wait for the action bar per step
+TURN_WAIT_SECONDS = 30.0             # idle wait for a turn event before re-checking
+DEFAULT_TIMEOUT_MS = 1500            # fail fast on missing selectors
+NAVIGATION_TIMEOUT_MS = 30000        # page loads keep Playwright's usual budget
 HEADLESS = False                     # set True when you do not need to observe
 DECISION_STEPS = 10                  # adjust or replace with hand-based logic
 VIEWPORT = {"width": 1200, "height": 800}  # keep screenshots consistent
@@ -38,10 +46,13 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(mess
 logger = logging.getLogger("pokerbot")
 
 
-@dataclass
+@dataclass(slots=True)
 class TableState:
     """
     Normalized representation of the table state.
+
+    Uses __slots__: one is built per decision step, so skipping the
+    per-instance __dict__ keeps long sessions light on allocations.
     """
 
     hero_cards: List[str]
@@ -54,6 +65,14 @@ class TableState:
     raw: Dict  # raw vision output for debugging or future extensions
 
 
+_STATE_FIELDS = tuple(f.name for f in fields(TableState))
+
+
+def _state_as_dict(state: TableState) -> Dict:
+    """Shallow field -> value mapping of a TableState (it has no __dict__)."""
+    return {name: getattr(state, name) for name in _STATE_FIELDS}
+
+
 def _street_from_board(board: List[str]) -> str:
     """Derive street name from board length."""
     length = len(board)
@@ -66,11 +85,23 @@ def _street_from_board(board: List[str]) -> str:
     return "preflop"
 
 
+def _as_card_list(value) -> List[str]:
+    """Reuse list inputs as-is; materialize other iterables (or None) once."""
+    if isinstance(value, list):
+        return value
+    return list(value) if value else []
+
+
 def normalize_state(raw_state: Dict) -> TableState:
-    """Convert raw state dictionary from vision.capture into a TableState object."""
-    board_cards = list(raw_state.get("board", []))
+    """
+    Convert raw state dictionary from vision.capture into a TableState object.
+
+    Card lists from vision.capture are fresh per frame and never mutated
+    downstream, so they are referenced rather than copied.
+    """
+    board_cards = _as_card_list(raw_state.get("board"))
     return TableState(
-        hero_cards=list(raw_state.get("hero_cards", [])),
+        hero_cards=_as_card_list(raw_state.get("hero_cards")),
         board=board_cards,
         pot=raw_state.get("pot"),
         to_act=raw_state.get("to_act", "hero"),
@@ -87,43 +118,204 @@ def decide_action(state: TableState) -> Action:
 
     For now, uses solver.lookup.lookup_strategy (stub) and solver.decision.choose_action.
     """
-    probs = lookup.lookup_strategy(state.__dict__)
+    probs = lookup.lookup_strategy(_state_as_dict(state))
     action = decision.choose_action(probs)
     return action
 
 
-def run_single_decision_step(page, dry_run: bool = False) -> None:
+def _decide_batch(state_dicts: Sequence[Dict]) -> List[Action]:
+    """One bulk solver query plus one vectorized argmax for the whole batch."""
+    return decision.choose_actions(lookup.lookup_strategies(state_dicts))
+
+
+def decide_actions(states: Sequence[TableState]) -> List[Action]:
+    """Batched decide_action for several tables at once."""
+    return _decide_batch([_state_as_dict(state) for state in states])
+
+
+async def _decide_action_async(state: TableState, solver: Optional[BatchingSolverClient]) -> Action:
+    """Decide via the batching solver client when one is running, else directly."""
+    if solver is None:
+        return decide_action(state)
+    return await asyncio.wrap_future(solver.submit(_state_as_dict(state)))
+
+
+async def run_single_decision_step(
+    page,
+    dry_run: bool = False,
+    solver: Optional[BatchingSolverClient] = None,
+) -> None:
     """
     Perform one full perception -> decision -> action loop.
 
     Steps:
-      1. Capture screenshot from the Playwright page
-      2. Let vision.capture parse cards and other state
-      3. Normalize the raw state into a TableState
-      4. Decide an action
-      5. Click the corresponding UI button via DOM (skipped if dry_run)
+      1. Wait for the action bar to become visible (our turn)
+      2. Capture screenshot from the Playwright page
+      3. Let vision.capture parse cards and other state
+      4. Normalize the raw state into a TableState
+      5. Decide an action (through the batching solver client, if given)
+      6. Click the corresponding UI button via DOM (skipped if dry_run)
     """
+    if not await browser_control.wait_for_action_bar(page, timeout=TURN_TIMEOUT_MS):
+        logger.info("Action bar not visible after %sms; skipping step", TURN_TIMEOUT_MS)
+        return
+
     dump_dir = str(DEBUG_DUMP_DIR) if DEBUG_DUMP_IMAGES else None
-    raw_state = capture.capture_state_from_playwright(page, dump_dir=dump_dir)
+    raw_state = await capture.capture_state_from_playwright(page, dump_dir=dump_dir)
     state = normalize_state(raw_state)
-    action = decide_action(state)
-
-    logger.info(
-        "State hero=%s board=%s street=%s pot=%s stack=%s bet_to_call=%s -> action=%s (shot=%s)",
-        state.hero_cards,
-        state.board,
-        state.street,
-        state.pot,
-        state.stack,
-        state.bet_to_call,
-        action,
-        raw_state.get("screenshot_path"),
-    )
+    action = await _decide_action_async(state, solver)
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "State hero=%s board=%s street=%s pot=%s stack=%s bet_to_call=%s -> action=%s (shot=%s)",
+            state.hero_cards,
+            state.board,
+            state.street,
+            state.pot,
+            state.stack,
+            state.bet_to_call,
+            action,
+            raw_state.get("screenshot_path"),
+            # Structured copy for JSON/log-shipping handlers.
+            extra={"hero": state.hero_cards, "board": state.board, "street": state.street, "action": action},
+        )
 
     if dry_run:
         return
 
-    browser_control.click_action_playwright(page, action)
+    await browser_control.click_action_playwright(page, action)
+
+
+async def _open_table(browser, url: str):
+    """
+    Open one table page, hook up turn notifications and wait for it to settle.
+
+    Returns (page, turn_event); the page sets turn_event whenever the action
+    bar is visible after a DOM change.
+    """
+    page = await browser.new_page(viewport=VIEWPORT)
+    # Selector waits fail fast; navigation would otherwise inherit that
+    # 1.5 s default and abort on any table slower to settle than localhost.
+    page.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    page.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+    turn = asyncio.Event()
+    await browser_control.install_turn_observer(page, turn.set)
+    await page.goto(url, timeout=NAVIGATION_TIMEOUT_MS)
+    await page.wait_for_load_state("networkidle", timeout=NAVIGATION_TIMEOUT_MS)
+    return page, turn
+
+
+async def _run_table(
+    page,
+    turn: asyncio.Event,
+    sem: asyncio.Semaphore,
+    solver: Optional[BatchingSolverClient] = None,
+    steps: int = DECISION_STEPS,
+) -> None:
+    """
+    Drive `steps` decisions on one page, bounded by the shared semaphore.
+
+    Sleeps on the page's turn event between steps, so nothing runs while
+    opponents act. If no event arrives within TURN_WAIT_SECONDS the step
+    runs anyway and its own action-bar check decides.
+    """
+    for _ in range(steps):
+        try:
+            await asyncio.wait_for(turn.wait(), timeout=TURN_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.debug("No turn event on %s within %ss", page.url, TURN_WAIT_SECONDS)
+        turn.clear()
+
+        async with sem:
+            try:
+                await run_single_decision_step(page, solver=solver)
+            except Exception as exc:
+                logger.exception("Decision step failed on %s: %s", page.url, exc)
+
+
+def _warmup_pipeline() -> None:
+    """Run one throwaway perception -> decision pass on a synthetic state."""
+    capture.warmup()
+    decide_action(normalize_state({}))
+
+
+async def _warmup(tables: Sequence[Tuple[object, asyncio.Event]]) -> None:
+    """
+    Shift cold-start latency (template loading, first detection, lookup,
+    Playwright selector engine) from the first real hand to start-up.
+    """
+    await asyncio.to_thread(_warmup_pipeline)
+    await asyncio.gather(*(browser_control.wait_for_action_bar(page, timeout=100) for page, _ in tables))
+
+
+class BotSession:
+    """
+    Long-lived bot resources: Playwright driver, browser, table pages and
+    (when multi-tabling) the batching solver client.
+
+    Everything is created (and warmed up) once in __aenter__ and reused by
+    every call to run(), so Chromium start-up is paid once per process
+    rather than per run. Use as `async with BotSession() as session: await session.run()`.
+    """
+
+    def __init__(self, table_urls: Optional[Sequence[str]] = None, headless: Optional[bool] = None) -> None:
+        self.table_urls = list(table_urls or TABLE_URLS)
+        self.headless = HEADLESS if headless is None else headless
+        self.browser = None
+        self.tables: List[Tuple[object, asyncio.Event]] = []
+        self.solver: Optional[BatchingSolverClient] = None
+        self._playwright = None
+
+    async def __aenter__(self) -> "BotSession":
+        self._playwright = await async_playwright().start()
+        try:
+            self.browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.tables = list(await asyncio.gather(*(_open_table(self.browser, url) for url in self.table_urls)))
+
+            # Batching only pays off when several tables can share a solver call;
+            # a single table would just wait out the flush interval.
+            if len(self.tables) > 1:
+                self.solver = BatchingSolverClient(
+                    _decide_batch,
+                    batch_size=SOLVER_BATCH_SIZE,
+                    flush_interval=SOLVER_FLUSH_MS / 1000.0,
+                )
+
+            await _warmup(self.tables)
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Release the solver client, browser and driver; safe to call twice."""
+        if self.solver is not None:
+            self.solver.close()
+            self.solver = None
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self.tables = []
+
+    async def run(self, steps: int = DECISION_STEPS) -> None:
+        """Play `steps` decisions on every open table concurrently."""
+        sem = asyncio.Semaphore(MAX_CONCURRENT_STEPS)
+        tasks = [
+            asyncio.create_task(_run_table(page, turn, sem, self.solver, steps))
+            for page, turn in self.tables
+        ]
+        await asyncio.gather(*tasks)
+
+
+async def _async_main() -> None:
+    async with BotSession() as session:
+        await session.run()
 
 
 def main() -> None:
@@ -133,29 +325,18 @@ def main() -> None:
     Robustness notes:
       - Exceptions within the loop are logged and skipped so a single failure
         does not crash the process.
+      - Steps are paced by UI readiness, not by fixed sleeps: each table
+        waits for a MutationObserver-driven turn event (see _run_table).
+      - Every page in TABLE_URLS is driven from one asyncio event loop, so
+        screenshots, detection and clicks on different tables overlap.
     """
-    if sync_playwright is None:
+    if async_playwright is None:
         raise RuntimeError("playwright is not installed; install it to run the bot")
 
     if DEBUG_DUMP_IMAGES:
         DEBUG_DUMP_DIR.mkdir(parents=True, exist_ok=True)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=HEADLESS)
-        page = browser.new_page()
-        page.set_viewport_size(VIEWPORT)
-
-        page.goto(TABLE_URL)
-        page.wait_for_timeout(2000)
-
-        for _ in range(DECISION_STEPS):
-            try:
-                run_single_decision_step(page)
-            except Exception as exc:
-                logger.exception("Decision step failed: %s", exc)
-            time.sleep(LOOP_DELAY_SECONDS)
-
-        browser.close()
+    asyncio.run(_async_main())
 
 
 if __name__ == "__main__":
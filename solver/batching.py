@@ -0,0 +1,111 @@
+"""Batch strategy queries so one solver call serves several table states.
+
+A real solver backend (subprocess, GPU model, remote service) pays a fixed
+round-trip per call. BatchingSolverClient queues individual requests from
+any thread, drains them in groups of up to batch_size (or whatever arrived
+within flush_interval of the first request), issues one bulk query and
+resolves each caller's Future with its own result.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# query_batch(states) -> one result per state, in order (e.g. action
+# probabilities from lookup.lookup_strategies, or chosen actions).
+BatchQuery = Callable[[Sequence[Dict]], Sequence[Any]]
+
+_Request = Tuple[Dict, Future]
+
+
+class BatchingSolverClient:
+    """
+    Background-thread batcher in front of a bulk solver query.
+
+    Usage:
+        with BatchingSolverClient(lookup.lookup_strategies) as client:
+            probs = client.submit(table_state).result()
+    """
+
+    def __init__(
+        self,
+        query_batch: BatchQuery,
+        batch_size: int = 32,
+        flush_interval: float = 0.05,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self._query_batch = query_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._closed = False
+        # Guards _closed together with queue puts, so no request can be
+        # queued behind the shutdown sentinel.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="solver-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, table_state: Dict) -> Future:
+        """Queue one state; the returned Future resolves to its result."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchingSolverClient is closed")
+            self._queue.put((table_state, future))
+        return future
+
+    def close(self) -> None:
+        """Flush pending requests and stop the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "BatchingSolverClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch: List[_Request] = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_Request]) -> None:
+        live = [(state, future) for state, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            results = self._query_batch([state for state, _ in live])
+            if len(results) != len(live):
+                raise RuntimeError(f"Solver returned {len(results)} results for {len(live)} states")
+        except Exception as exc:
+            for _, future in live:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(live, results):
+            future.set_result(result)
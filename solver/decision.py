@@ -1,28 +1,53 @@
 """Decision logic that picks a discrete action from solver output."""
-from typing import Dict, Literal
+from typing import Dict, List, Literal, Mapping, Sequence, Tuple
 
-Action = Literal["fold", "call", "raise"]
+import numpy as np
 
+Action = Literal["fold", "call", "raise"]
 
-def _normalize_probs(probs: Dict[str, float]) -> Dict[Action, float]:
-    """Ensure keys/values are valid and sum to 1.0."""
-    filtered = {k.lower(): float(v) for k, v in probs.items() if k.lower() in {"fold", "call", "raise"}}
-    total = sum(v for v in filtered.values() if v > 0)
-    if total <= 0:
-        return {"fold": 0.0, "call": 1.0, "raise": 0.0}
-    return {k: v / total for k, v in filtered.items()}  # type: ignore[return-value]
+# Column order for batched decisions. argmax returns the first maximum, so
+# this order doubles as the call > raise > fold tie-break.
+_ACTIONS: Tuple[Action, ...] = ("call", "raise", "fold")
 
 
-def choose_action(action_probs: Dict[str, float]) -> Action:
+def choose_action(action_probs: Mapping[str, float]) -> Action:
     """
     Convert a probability distribution into a single action.
 
     Deterministic: picks the action with max probability, breaking ties
-    by preferring call > raise > fold (arbitrary but stable).
+    by preferring call > raise > fold (arbitrary but stable). Defaults to
+    call when no action has positive probability.
+
+    Normalizing does not change the argmax, so the three values are compared
+    directly instead of building a normalized dict.
+    """
+    fold = float(action_probs.get("fold", 0.0))
+    call = float(action_probs.get("call", 0.0))
+    raise_ = float(action_probs.get("raise", 0.0))
+
+    if max(fold, 0.0) + max(call, 0.0) + max(raise_, 0.0) <= 0.0:
+        return "call"
+    if call >= raise_ and call >= fold:
+        return "call"
+    if raise_ >= fold:
+        return "raise"
+    return "fold"
+
+
+def choose_actions(batch: Sequence[Mapping[str, float]]) -> List[Action]:
+    """
+    Vectorized choose_action for many tables at once.
+
+    Stacks the distributions into an (M, 3) array and takes one argmax per
+    row; rows with no positive probability default to call, matching
+    choose_action exactly.
     """
-    normalized = _normalize_probs(action_probs)
-    priority = {"call": 2, "raise": 1, "fold": 0}
-    return max(normalized.items(), key=lambda kv: (kv[1], priority[kv[0]]))[0]  # type: ignore[return-value]
+    if not batch:
+        return []
+    probs = np.array([[p.get(a, 0.0) for a in _ACTIONS] for p in batch], dtype=np.float64)
+    idx = probs.argmax(axis=1)
+    idx[np.maximum(probs, 0.0).sum(axis=1) <= 0.0] = 0
+    return [_ACTIONS[i] for i in idx.tolist()]
 
 
 def pick_action(solution: Dict, table_state: Dict) -> Action:
@@ -5,45 +5,128 @@ are available. Interfaces are kept stable so downstream code will not need
 to change when you plug in real data.
 """
 import json
+import math
+import mmap
+import os
+import types
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, falls back to json
+    orjson = None  # type: ignore
 
 DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "lookups"
 
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+# Card index = rank * 4 + suit, so each rank owns four adjacent bits.
+DECK = tuple(rank + suit for rank in RANKS for suit in SUITS)
+
+
+def _card_spellings(card: str) -> Set[str]:
+    rank, suit = card
+    ranks = {rank, rank.lower()} | ({"10"} if rank == "T" else set())
+    return {r + s for r in ranks for s in (suit, suit.upper())}
+
+
+# Every accepted spelling ("As", "as", "AS", "10h", ...) -> single-bit mask.
+_CARD_TO_BIT: Dict[str, int] = {
+    spelling: 1 << index for index, card in enumerate(DECK) for spelling in _card_spellings(card)
+}
+ACE_MASK = 0xF << (RANKS.index("A") * 4)
 
+# Placeholder strategies, shared read-only across calls.
+_PROBS_ACE: Mapping[str, float] = types.MappingProxyType({"fold": 0.1, "call": 0.2, "raise": 0.7})
+_PROBS_POSTFLOP: Mapping[str, float] = types.MappingProxyType({"fold": 0.25, "call": 0.6, "raise": 0.15})
+_PROBS_PREFLOP: Mapping[str, float] = types.MappingProxyType({"fold": 0.4, "call": 0.5, "raise": 0.1})
+
+
+def cards_to_mask(cards: Iterable[str]) -> int:
+    """Encode card codes as a 52-bit mask; unknown codes are ignored."""
+    mask = 0
+    for card in cards:
+        mask |= _CARD_TO_BIT.get(card, 0)
+    return mask
+
+
+@lru_cache(maxsize=32)
 def load_lookup_file(name: str) -> Dict:
-    """Load a JSON lookup table by name from data/lookups/<name>.json."""
+    """
+    Load a JSON lookup table by name from data/lookups/<name>.json.
+
+    Files are parsed with orjson straight from a read-only mmap when orjson
+    is installed, else with the stdlib json module. Lookup files do not
+    change during a run, so the parsed table is cached per name; treat the
+    returned dict as read-only.
+    """
     path = DATA_DIR / f"{name}.json"
     if not path.exists():
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return {}
+        if orjson is None:
+            return json.load(handle)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            view = memoryview(buf)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def _bet_bucket(bet_to_call: Optional[float]) -> Optional[int]:
+    """Bucket bet_to_call into log2 bins so small numeric jitter shares a cache key."""
+    if not bet_to_call or bet_to_call <= 0:
+        return None
+    return math.frexp(float(bet_to_call))[1]
+
 
+@lru_cache(maxsize=4096)
+def _lookup_cached(
+    hero_cards: Tuple[str, ...],
+    board: Tuple[str, ...],
+    bet_bucket: Optional[int],
+) -> Mapping[str, float]:
+    """Memoized strategy lookup keyed on hashable state features."""
+    if cards_to_mask(hero_cards) & ACE_MASK:
+        return _PROBS_ACE
+    if len(board) >= 3:
+        return _PROBS_POSTFLOP
+    return _PROBS_PREFLOP
 
-def lookup_strategy(table_state: Dict) -> Dict[str, float]:
+
+def lookup_strategy(table_state: Dict) -> Mapping[str, float]:
     """
     Placeholder strategy lookup.
 
-    Returns a deterministic probability distribution over actions:
+    Returns a deterministic, read-only probability distribution over actions:
       {"fold": p, "call": p, "raise": p}
 
     The distribution is seeded by simple features (board length, presence of Ace)
     so that tests can assert stable outputs before real solvers are wired in.
+
+    Results are memoized per (hero_cards, board, bet_to_call bucket); states
+    repeat often within a session, so repeated lookups are a dict hit.
     """
-    hero_cards = [c.lower() for c in table_state.get("hero_cards", [])]
-    board = table_state.get("board", []) or []
+    return _lookup_cached(
+        tuple(table_state.get("hero_cards") or ()),
+        tuple(table_state.get("board") or ()),
+        _bet_bucket(table_state.get("bet_to_call")),
+    )
 
-    has_ace = any(c.startswith("a") for c in hero_cards)
-    board_len = len(board)
 
-    if has_ace:
-        probs = {"fold": 0.1, "call": 0.2, "raise": 0.7}
-    elif board_len >= 3:
-        probs = {"fold": 0.25, "call": 0.6, "raise": 0.15}
-    else:
-        probs = {"fold": 0.4, "call": 0.5, "raise": 0.1}
+def lookup_strategies(table_states: Sequence[Dict]) -> List[Mapping[str, float]]:
+    """
+    Bulk variant of lookup_strategy: one result per state, in order.
 
-    return probs
+    This is the query_batch hook for solver.batching.BatchingSolverClient;
+    a real backend should answer the whole batch in a single call.
+    """
+    return [lookup_strategy(state) for state in table_states]
 
 
 # TODO: replace lookup_strategy with real table lookup once lookups are available.
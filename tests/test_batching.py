@@ -0,0 +1,75 @@
+import threading
+import time
+import unittest
+
+from solver import lookup
+from solver.batching import BatchingSolverClient
+
+
+class BatchingSolverClientTests(unittest.TestCase):
+    def test_results_match_direct_lookup(self):
+        states = [
+            {"hero_cards": ["As", "Kd"], "board": []},
+            {"hero_cards": ["7c", "2d"], "board": ["2c", "7h", "Jh"]},
+            {"hero_cards": ["7c", "2d"], "board": []},
+        ]
+        with BatchingSolverClient(lookup.lookup_strategies, flush_interval=0.01) as client:
+            futures = [client.submit(state) for state in states]
+            results = [future.result(timeout=1) for future in futures]
+        self.assertEqual(results, [lookup.lookup_strategy(state) for state in states])
+
+    def test_concurrent_submits_share_one_call(self):
+        calls = []
+
+        def query_batch(states):
+            calls.append(len(states))
+            return [{"call": 1.0} for _ in states]
+
+        with BatchingSolverClient(query_batch, batch_size=4, flush_interval=0.5) as client:
+            futures = [client.submit({"i": i}) for i in range(4)]
+            for future in futures:
+                self.assertEqual(future.result(timeout=1), {"call": 1.0})
+        self.assertEqual(calls, [4])
+
+    def test_solver_errors_propagate_to_every_caller(self):
+        def query_batch(states):
+            raise ValueError("solver down")
+
+        with BatchingSolverClient(query_batch, flush_interval=0.01) as client:
+            futures = [client.submit({}), client.submit({})]
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result(timeout=1)
+
+    def test_submit_after_close_raises(self):
+        client = BatchingSolverClient(lookup.lookup_strategies)
+        client.close()
+        with self.assertRaises(RuntimeError):
+            client.submit({})
+
+
+    def test_submits_racing_close_resolve_or_raise(self):
+        client = BatchingSolverClient(lambda states: [None for _ in states], flush_interval=0.001)
+        futures = []
+        rejected = []
+
+        def spam():
+            while True:
+                try:
+                    futures.append(client.submit({}))
+                except RuntimeError:
+                    rejected.append(True)
+                    return
+
+        thread = threading.Thread(target=spam)
+        thread.start()
+        time.sleep(0.02)
+        client.close()
+        thread.join(timeout=1)
+        self.assertTrue(rejected)
+        for future in futures:
+            self.assertIsNone(future.result(timeout=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
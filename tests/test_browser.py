@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from vision import browser
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class FakeContext:
+    browser = None
+
+    def __init__(self):
+        self.pages = [FakePage()]
+        self.closed = False
+
+    def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.launches = []
+        self.stopped = False
+        self.chromium = self
+
+    def launch_persistent_context(self, user_data_dir, **kwargs):
+        self.launches.append((user_data_dir, kwargs))
+        return FakeContext()
+
+    def stop(self):
+        self.stopped = True
+
+
+class BrowserSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+
+        def fake_sync_playwright():
+            pw = FakePlaywright()
+            self.started.append(pw)
+            return mock.Mock(start=lambda: pw)
+
+        patches = [
+            mock.patch.object(browser, "sync_playwright", fake_sync_playwright),
+            mock.patch.object(browser, "USER_DATA_DIR", mock.MagicMock()),
+            mock.patch.object(browser, "_SESSION", None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(browser._shutdown)
+
+    def test_context_launched_once_and_reused(self):
+        _, context, page = browser.get_page()
+        _, context2, page2 = browser.get_page()
+        self.assertIs(context, context2)
+        self.assertIs(page, page2)
+        self.assertEqual(len(self.started), 1)
+        self.assertEqual(len(self.started[0].launches), 1)
+
+    def test_closed_page_is_replaced(self):
+        _, context, page = browser.get_page()
+        page.closed = True
+        _, _, page2 = browser.get_page()
+        self.assertIsNot(page, page2)
+        self.assertIn(page2, context.pages)
+
+    def test_new_viewport_relaunches(self):
+        _, context, _ = browser.get_page(viewport=(800, 600))
+        browser.get_page(viewport=(1200, 800))
+        self.assertTrue(context.closed)
+        self.assertTrue(self.started[0].stopped)
+        self.assertEqual(len(self.started), 2)
+
+    def test_shutdown_closes_session(self):
+        _, context, _ = browser.get_page()
+        browser._shutdown()
+        self.assertTrue(context.closed)
+        self.assertIsNone(browser._SESSION)
+
+
+if __name__ == "__main__":
+    unittest.main()
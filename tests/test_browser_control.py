@@ -1,8 +1,5 @@
-import json
-import tempfile
 import unittest
-from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from automation import browser_control
 
@@ -11,47 +8,81 @@ class DummyLocator:
     def __init__(self, should_raise: bool = False):
         self.clicked = False
         self.should_raise = should_raise
+        self.timeout = None
 
-    def click(self, timeout: int = 2000):
+    @property
+    def first(self):
+        return self
+
+    async def click(self, timeout: int = 2000):
         if self.should_raise:
-            raise Exception("text click failed")
+            raise Exception("click failed")
         self.clicked = True
+        self.timeout = timeout
 
 
-class BrowserControlTests(unittest.TestCase):
-    def test_click_prefers_id_selector(self):
-        page = Mock()
-        page.click.return_value = None  # id click succeeds
-
-        browser_control.click_action_playwright(page, "fold")
+def make_page(locator: DummyLocator = None) -> Mock:
+    page = Mock()
+    page.locator.return_value = locator or DummyLocator()
+    page.wait_for_selector = AsyncMock()
+    return page
 
-        page.click.assert_called_once_with("#fold", timeout=2000)
-        page.get_by_text.assert_not_called()
 
-    def test_falls_back_to_text_locator(self):
-        page = Mock()
-        page.click.side_effect = Exception("id not found")
+class BrowserControlTests(unittest.IsolatedAsyncioTestCase):
+    async def test_click_uses_compound_id_or_text_locator(self):
         locator = DummyLocator()
-        page.get_by_text.return_value = locator
+        page = make_page(locator)
 
-        browser_control.click_action_playwright(page, "call")
+        await browser_control.click_action_playwright(page, "fold")
 
-        page.click.assert_called_once_with("#call", timeout=2000)
-        page.get_by_text.assert_called_once_with("Call", exact=True)
+        page.locator.assert_called_once_with("#fold:visible, button:text-is('Fold')")
         self.assertTrue(locator.clicked)
+        self.assertEqual(locator.timeout, browser_control.CLICK_TIMEOUT_MS)
+
+    async def test_action_is_case_insensitive(self):
+        page = make_page()
+
+        await browser_control.click_action_playwright(page, "Call")  # type: ignore[arg-type]
+
+        page.locator.assert_called_once_with("#call:visible, button:text-is('Call')")
 
-    def test_invalid_action_raises_value_error(self):
-        page = Mock()
+    async def test_invalid_action_raises_value_error(self):
+        page = make_page()
         with self.assertRaises(ValueError):
-            browser_control.click_action_playwright(page, "check")  # type: ignore[arg-type]
+            await browser_control.click_action_playwright(page, "check")  # type: ignore[arg-type]
 
-    def test_raises_when_nothing_found(self):
-        page = Mock()
-        page.click.side_effect = Exception("id not found")
-        page.get_by_text.return_value = DummyLocator(should_raise=True)
+    async def test_raises_when_nothing_found(self):
+        page = make_page(DummyLocator(should_raise=True))
 
         with self.assertRaises(RuntimeError):
-            browser_control.click_action_playwright(page, "fold")
+            await browser_control.click_action_playwright(page, "fold")
+
+    async def test_wait_for_action_bar_reports_visibility(self):
+        page = make_page()
+        self.assertTrue(await browser_control.wait_for_action_bar(page, timeout=500))
+        page.wait_for_selector.assert_awaited_once_with(
+            browser_control.ACTION_BAR_SELECTOR, state="visible", timeout=500
+        )
+
+        page.wait_for_selector.side_effect = Exception("timeout")
+        self.assertFalse(await browser_control.wait_for_action_bar(page))
+
+    async def test_install_turn_observer_exposes_binding_and_script(self):
+        page = make_page()
+        page.expose_binding = AsyncMock()
+        page.add_init_script = AsyncMock()
+        page.evaluate = AsyncMock()
+        turns = []
+
+        await browser_control.install_turn_observer(page, lambda: turns.append(True))
+
+        name, callback = page.expose_binding.await_args.args
+        self.assertEqual(name, browser_control.TURN_BINDING_NAME)
+        callback(object())  # Playwright passes the binding source first
+        self.assertEqual(turns, [True])
+        script = page.add_init_script.await_args.args[0]
+        self.assertIn(browser_control.ACTION_BAR_SELECTOR, script)
+        page.evaluate.assert_awaited_once_with(script)
 
 
 if __name__ == "__main__":
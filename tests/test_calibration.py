@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from vision import calibration
+
+
+class EmitTemplatesTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.image = Image.fromarray(rng.integers(0, 256, size=(120, 200, 3), dtype=np.uint8))
+        self.config = {"corner_crop": {"x": 2, "y": 3, "w": 12, "h": 16}, "card_slot": {}}
+
+    def _emit(self, region, cards, out_dir, dump_slots=False):
+        calibration._emit_templates(
+            image=self.image,
+            region=region,
+            cards=cards,
+            config=self.config,
+            out_dir=out_dir,
+            prefix="hero",
+            overwrite=True,
+            dump_slots=dump_slots,
+        )
+
+    def test_templates_match_pil_corner_crops(self):
+        region = (20, 30, 120, 60)
+        cards = ["As", "Kd", "7h"]
+        with tempfile.TemporaryDirectory() as tmp:
+            self._emit(region, cards, Path(tmp))
+            for card, (x, y, w, h) in zip(cards, calibration._slot_boxes(region, 3, {})):
+                expected = self.image.crop((x + 2, y + 3, x + 14, y + 19)).convert("L")
+                written = Image.open(Path(tmp) / f"{card}.png")
+                np.testing.assert_array_equal(np.asarray(written), np.asarray(expected))
+
+    def test_slot_dumps_written_alongside_templates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self._emit((20, 30, 120, 60), ["As", "Kd"], Path(tmp), dump_slots=True)
+            slot = np.asarray(Image.open(Path(tmp) / "slots" / "hero_1.png"))
+            self.assertTrue((Path(tmp) / "Kd.png").exists())
+        np.testing.assert_array_equal(slot, np.asarray(self.image)[30:90, 80:140])
+
+    def test_repeated_card_is_written_once(self):
+        region = (20, 30, 120, 60)
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(calibration, "_save_png", wraps=calibration._save_png) as save:
+            self._emit(region, ["As", "As", "Kd"], Path(tmp))
+            written = np.asarray(Image.open(Path(tmp) / "As.png"))
+        paths = [call.args[0] for call in save.call_args_list]
+        self.assertEqual(sorted(p.name for p in paths), ["As.png", "Kd.png"])
+        # With overwrite, the later corner wins, as a serial write would.
+        x, y, _, _ = calibration._slot_boxes(region, 3, {})[1]
+        expected = self.image.crop((x + 2, y + 3, x + 14, y + 19)).convert("L")
+        np.testing.assert_array_equal(written, np.asarray(expected))
+
+    def test_slot_boxes_are_memoized(self):
+        cfg = {"w": 20, "h": 30, "x_spacing": 5}
+        first = calibration._slot_boxes((10, 20, 100, 40), 3, cfg)
+        self.assertEqual(first, ((10, 20, 20, 30), (35, 20, 20, 30), (60, 20, 20, 30)))
+        self.assertIs(calibration._slot_boxes([10, 20, 100, 40], 3, dict(cfg)), first)
+
+    def test_slot_boxes_accept_unhashable_config_values(self):
+        cfg = {"w": 20, "h": 30, "x_spacing": 5, "notes": ["hand-tuned"], "extra": {"a": 1}}
+        self.assertEqual(
+            calibration._slot_boxes((10, 20, 100, 40), 2, cfg),
+            ((10, 20, 20, 30), (35, 20, 20, 30)),
+        )
+
+    def test_corners_past_frame_edge_are_black(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self._emit((190, 110, 10, 10), ["As"], Path(tmp))
+            written = np.asarray(Image.open(Path(tmp) / "As.png"))
+        self.assertEqual(written.shape, (16, 12))
+        self.assertEqual(int(written[-1, -1]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
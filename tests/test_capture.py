@@ -1,5 +1,10 @@
+import asyncio
 import io
+import tempfile
 import unittest
+from unittest import mock
+
+import numpy as np
 from PIL import Image
 
 from vision import capture
@@ -14,14 +19,32 @@ class DummyPage:
     def is_closed(self):
         return self._closed
 
-    def screenshot(self, full_page: bool = True):
+    def screenshot(self, full_page: bool = True, clip: dict = None, type: str = "png", quality: int = None):
         if self._raise:
             raise RuntimeError("boom")
+        image = self._image
+        if clip:
+            x, y = clip["x"], clip["y"]
+            image = image.crop((x, y, x + clip["width"], y + clip["height"]))
         buf = io.BytesIO()
-        self._image.save(buf, format="PNG")
+        image.save(buf, format="JPEG" if type == "jpeg" else "PNG")
         return buf.getvalue()
 
 
+class AsyncDummyPage(DummyPage):
+    def __init__(self, dom_texts: dict = None, **kwargs):
+        super().__init__(**kwargs)
+        self.shot_kwargs = None
+        self._dom_texts = dom_texts or {}
+
+    async def evaluate(self, script, arg=None):
+        return {key: self._dom_texts.get(key) for key in arg}
+
+    async def screenshot(self, **kwargs):
+        self.shot_kwargs = kwargs
+        return DummyPage.screenshot(self, **kwargs)
+
+
 class CaptureTests(unittest.TestCase):
     def test_screenshot_raises_when_page_closed(self):
         page = DummyPage(closed=True)
@@ -40,6 +63,290 @@ class CaptureTests(unittest.TestCase):
         cropped = capture.screenshot_page(page, region=region)
         self.assertEqual(cropped.size, (region[2], region[3]))
 
+    def test_screenshot_can_request_jpeg(self):
+        page = DummyPage()
+        image = capture.screenshot_page(page, image_format="jpeg")
+        self.assertEqual(image.size, (100, 50))
+
+    def test_union_region_covers_all_boxes(self):
+        self.assertIsNone(capture._union_region([None, None]))
+        self.assertEqual(
+            capture._union_region([(10, 20, 30, 40), None, (50, 5, 10, 10)]),
+            (10, 5, 50, 55),
+        )
+
+    def test_decode_gray_returns_luma_plane(self):
+        buf = io.BytesIO()
+        Image.new("RGBA", (7, 5), color=(10, 20, 30, 255)).save(buf, format="PNG")
+        frame = capture._decode_gray(buf.getvalue())
+        self.assertEqual(frame.shape, (5, 7))
+        self.assertEqual(frame.dtype.name, "uint8")
+
+    def test_decode_gray_matches_pil_luma_on_colour(self):
+        colours = [(255, 0, 0), (200, 30, 30), (0, 128, 0), (30, 60, 220), (250, 250, 250)]
+        rgb = np.array([colours * 3], dtype=np.uint8).repeat(4, axis=0)
+        buf = io.BytesIO()
+        Image.fromarray(rgb).save(buf, format="PNG")
+        expected = np.asarray(Image.open(io.BytesIO(buf.getvalue())).convert("L")).astype(np.int16)
+        frame = capture._decode_gray(buf.getvalue()).astype(np.int16)
+        self.assertLessEqual(int(np.abs(frame - expected).max()), 1)
+
+    def test_crop_region_of_array_is_a_view(self):
+        frame = np.zeros((50, 100, 3), dtype=np.uint8)
+        crop = capture.crop_region(frame, (10, 20, 30, 40))
+        self.assertEqual(crop.shape, (30, 30, 3))
+        self.assertTrue(np.shares_memory(crop, frame))
+
+    def test_warmup_runs_without_templates(self):
+        capture.warmup()
+
+
+class AsyncCaptureTests(unittest.IsolatedAsyncioTestCase):
+    async def test_async_screenshot_requests_jpeg_by_default(self):
+        page = AsyncDummyPage()
+        data = await capture._screenshot_bytes_async(page)
+        self.assertEqual(page.shot_kwargs["type"], "jpeg")
+        self.assertEqual(page.shot_kwargs["quality"], capture.DETECTION_JPEG_QUALITY)
+        with Image.open(io.BytesIO(data)) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (100, 50))
+
+    async def test_async_screenshot_png_has_no_quality(self):
+        page = AsyncDummyPage()
+        await capture._screenshot_bytes_async(page, image_format="png")
+        self.assertEqual(page.shot_kwargs["type"], "png")
+        self.assertNotIn("quality", page.shot_kwargs)
+
+    async def test_capture_clips_to_configured_regions(self):
+        capture._FRAME_CACHE.clear()
+        regions = {key: None for key in ("pot_region", "stack_region", "bet_to_call_region", "action_region")}
+        regions.update(hero_region=(10, 60, 40, 20), board_region=(10, 10, 80, 20))
+        page = AsyncDummyPage(image=Image.new("RGB", (200, 100), color="white"))
+        capture._REGION_CACHE.clear()
+
+        def find_cards(crop):
+            # One card inside the 80x20 board crop, none in the hero crop.
+            return [("As", (5, 2, 10, 10))] if crop.shape[1] == 80 else []
+
+        with mock.patch.object(capture, "_resolve_regions", mock.AsyncMock(return_value=regions)), \
+                mock.patch.object(capture.card_reader, "find_cards", side_effect=find_cards):
+            state = await capture.capture_state_from_playwright(page)
+        self.assertEqual(page.shot_kwargs["clip"], {"x": 10, "y": 10, "width": 80, "height": 70})
+        self.assertEqual(state["raw_detections"], [("As", (15, 12, 10, 10))])
+        self.assertEqual(state["board"], ["As"])
+        self.assertEqual(state["hero_cards"], [])
+
+    async def test_partial_regions_capture_full_page(self):
+        capture._FRAME_CACHE.clear()
+        regions = {key: None for key in ("hero_region", "board_region", "stack_region", "bet_to_call_region", "action_region")}
+        regions["pot_region"] = (40, 40, 30, 10)
+        page = AsyncDummyPage(image=Image.new("RGB", (200, 100), color="white"))
+
+        with mock.patch.object(capture, "_resolve_regions", mock.AsyncMock(return_value=regions)), \
+                mock.patch.object(capture.card_reader, "find_cards", return_value=[]) as find_cards:
+            await capture.capture_state_from_playwright(page)
+        self.assertNotIn("clip", page.shot_kwargs)
+        self.assertEqual(find_cards.call_args[0][0].shape[:2], (100, 200))
+
+    def _region_frame(self, hero_color, board_color):
+        frame = np.zeros((40, 60), dtype=np.uint8)
+        frame[0:10, 0:60] = board_color
+        frame[30:40, 0:20] = hero_color
+        return frame
+
+    async def test_unchanged_region_reuses_detection(self):
+        capture._REGION_CACHE.clear()
+        regions = {"hero_region": (0, 30, 20, 10), "board_region": (0, 0, 60, 10)}
+        with mock.patch.object(capture.card_reader, "find_cards", return_value=[]) as find_cards:
+            capture._capture_state_from_regions(self._region_frame(7, 1), regions)
+            self.assertEqual(find_cards.call_count, 2)
+            # Board changed, hero did not: only the board is matched again.
+            capture._capture_state_from_regions(self._region_frame(7, 2), regions)
+        self.assertEqual(find_cards.call_count, 3)
+
+    async def test_calibrated_slots_route_region_crops_through_slot_search(self):
+        capture._REGION_CACHE.clear()
+        card_reader = capture.card_reader
+        card_reader._LAST_FRAME = None
+        self.addCleanup(setattr, card_reader, "_LAST_FRAME", None)
+        rng = np.random.default_rng(5)
+        glyph = rng.integers(0, 256, size=(12, 9), dtype=np.uint8)
+        frame = np.full((60, 80), 128, dtype=np.uint8)
+        frame[42:54, 33:42] = glyph  # second hero slot
+        config = dict(capture.load_config_cached())
+        config.update(card_slot={"w": 20, "h": 25, "x_spacing": 0, "y_spacing": 0}, hero_slots=2, board_slots=5)
+        regions = {"hero_region": (10, 35, 40, 25), "board_region": (0, 0, 80, 25)}
+
+        with mock.patch.object(capture, "load_config_cached", return_value=config), \
+                mock.patch.multiple(card_reader.TemplateStore, templates_loaded=True, codes=["As"], imgs=[glyph]), \
+                mock.patch.object(card_reader, "_match_slots", wraps=card_reader._match_slots) as match_slots:
+            state = capture._capture_state_from_regions(frame, regions)
+
+        hero_slots = match_slots.call_args_list[0].args[1]
+        self.assertEqual(hero_slots, ((0, 0, 20, 25), (20, 0, 20, 25)))
+        self.assertEqual(state["hero_cards"], ["As"])
+        self.assertEqual(state["board"], [])
+        self.assertEqual(state["raw_detections"], [("As", (33, 42, 9, 12))])
+
+    async def test_template_reload_invalidates_region_cache(self):
+        capture._REGION_CACHE.clear()
+        regions = {"hero_region": (0, 30, 20, 10), "board_region": (0, 0, 60, 10)}
+        frame = self._region_frame(7, 1)
+        with mock.patch.object(capture.card_reader, "find_cards", return_value=[]) as find_cards:
+            capture._capture_state_from_regions(frame, regions)
+            with mock.patch.object(capture.card_reader.TemplateStore, "generation",
+                                   capture.card_reader.TemplateStore.generation + 1):
+                capture._capture_state_from_regions(frame, regions)
+        self.assertEqual(find_cards.call_count, 4)
+
+    async def test_detection_frame_is_grayscale(self):
+        capture._FRAME_CACHE.clear()
+        page = AsyncDummyPage(image=Image.new("RGB", (30, 20), color="blue"))
+        with mock.patch.object(capture.card_reader, "find_cards", return_value=[]) as find_cards:
+            await capture.capture_state_from_playwright(page)
+        self.assertEqual(find_cards.call_args[0][0].shape, (20, 30))
+
+    async def test_frame_cache_misses_after_template_reload(self):
+        capture._FRAME_CACHE.clear()
+        page = AsyncDummyPage(image=Image.new("RGB", (30, 20), color="green"))
+        with mock.patch.object(capture.card_reader, "find_cards", return_value=[("As", (1, 2, 3, 4))]) as find_cards:
+            first = await capture.capture_state_from_playwright(page)
+            second = await capture.capture_state_from_playwright(page)
+            self.assertEqual(find_cards.call_count, 1)
+            with mock.patch.object(capture.card_reader.TemplateStore, "generation",
+                                   capture.card_reader.TemplateStore.generation + 1):
+                await capture.capture_state_from_playwright(page)
+        self.assertEqual(find_cards.call_count, 2)
+        # Cache hits hand out their own card lists.
+        self.assertEqual(second["raw_detections"], first["raw_detections"])
+        self.assertIsNot(second["raw_detections"], first["raw_detections"])
+        self.assertIsNot(second["board"], first["board"])
+
+    async def test_dump_dir_archives_png(self):
+        capture._FRAME_CACHE.clear()
+        page = AsyncDummyPage(image=Image.new("RGB", (60, 30), color="orange"))
+        with tempfile.TemporaryDirectory() as tmp:
+            state = await capture.capture_state_from_playwright(page, dump_dir=tmp)
+            capture.flush_dumps()
+            self.assertEqual(page.shot_kwargs["type"], "png")
+            with Image.open(state["screenshot_path"]) as dumped:
+                self.assertEqual(dumped.format, "PNG")
+                self.assertEqual(dumped.getpixel((0, 0)), (255, 165, 0))
+
+    async def test_dumps_use_counter_names_and_include_crops(self):
+        frame = np.zeros((20, 30, 3), dtype=np.uint8)
+        frame[10:20, 0:10] = 200
+        regions = {"hero_region": (5, 15, 10, 10), "board_region": None}
+        with tempfile.TemporaryDirectory() as tmp:
+            first = capture._dump_frames(frame, regions, tmp, origin=(5, 5))
+            second = capture._dump_frames(frame, regions, tmp, origin=(5, 5))
+            capture.flush_dumps()
+            self.assertNotEqual(first["screenshot_path"], second["screenshot_path"])
+            self.assertNotIn("board_crop_path", first)
+            with Image.open(first["hero_crop_path"]) as hero:
+                self.assertEqual(hero.size, (10, 10))
+                self.assertEqual(hero.getpixel((0, 0)), (200, 200, 200))
+
+    async def test_state_merges_dom_meta(self):
+        page = AsyncDummyPage(dom_texts={"pot": "$1,250", "bet_to_call": "Call 40"})
+        state = await capture.capture_state_from_playwright(page)
+        self.assertEqual(state["pot"], 1250.0)
+        self.assertEqual(state["bet_to_call"], 40.0)
+        self.assertIsNone(state["stack"])
+        self.assertEqual(state["hero_cards"], [])
+
+    async def test_unchanged_frame_reuses_detection(self):
+        capture._FRAME_CACHE.clear()
+        page = AsyncDummyPage(image=Image.new("RGB", (80, 40), color="purple"))
+        with mock.patch.object(capture.card_reader, "find_cards", return_value=[]) as find_cards:
+            first = await capture.capture_state_from_playwright(page)
+            second = await capture.capture_state_from_playwright(page)
+        self.assertEqual(find_cards.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(
+            await capture.screenshot_hash(page),
+            capture.frame_digest(await page.screenshot(type="jpeg", quality=85)),
+        )
+
+    async def test_capture_loop_prefetches_next_frame(self):
+        capture._FRAME_CACHE.clear()
+        page = AsyncDummyPage(image=Image.new("RGB", (40, 20), color="green"), dom_texts={"pot": "12"})
+        page.shots = 0
+        original = page.screenshot
+
+        async def counting_screenshot(**kwargs):
+            page.shots += 1
+            return await original(**kwargs)
+
+        page.screenshot = counting_screenshot
+        with mock.patch.object(capture.card_reader, "find_cards", return_value=[]):
+            async with capture.CaptureLoop(page) as loop:
+                state = await loop.next_state()
+                await asyncio.sleep(0)
+                self.assertEqual(page.shots, 2)
+                self.assertEqual(state["pot"], 12.0)
+                await loop.next_state()  # served by the prefetch
+                self.assertEqual(page.shots, 2)
+                loop.invalidate()
+                self.assertIsNone(loop._next)
+                await loop.next_state()  # fresh screenshot
+                self.assertEqual(page.shots, 3)
+        self.assertIsNone(loop._next)
+
+    async def test_dom_regions_read_once_per_url(self):
+        class BoxPage:
+            url = "http://table/1"
+            calls = 0
+
+            async def evaluate(self, script, arg=None):
+                BoxPage.calls += 1
+                return {
+                    "hero_region": {"x": 1.5, "y": 2, "width": 30, "height": 10},
+                    "board_region": {"x": 5, "y": 6, "width": 70, "height": 12},
+                }
+
+        page = BoxPage()
+        with mock.patch.object(capture, "load_config_cached", return_value={}):
+            regions = await capture._resolve_regions(page)
+            await capture._resolve_regions(page)
+            self.assertEqual(BoxPage.calls, 1)
+            page.url = "http://table/2"
+            await capture._resolve_regions(page)
+        self.assertEqual(BoxPage.calls, 2)
+        self.assertEqual(regions["hero_region"], (1, 2, 30, 10))
+        self.assertEqual(regions["board_region"], (5, 6, 70, 12))
+
+    async def test_dom_cards_skip_screenshot(self):
+        page = AsyncDummyPage()
+        page.evaluate = mock.AsyncMock(return_value={
+            "hero": ["as", "10h"],
+            "board": ["Kd", "7c", "2S"],
+            "texts": {"pot": "$30", "stack": None, "bet_to_call": "5"},
+        })
+        selectors = {"hero_selector": ".hero .card", "board_selector": ".board .card"}
+        with mock.patch.object(capture, "load_config_cached", return_value=selectors):
+            state = await capture.capture_state_from_playwright(page)
+        self.assertIsNone(page.shot_kwargs)
+        self.assertEqual(state["hero_cards"], ["As", "Th"])
+        self.assertEqual(state["board"], ["Kd", "7c", "2s"])
+        self.assertEqual(state["pot"], 30.0)
+        self.assertEqual(state["bet_to_call"], 5.0)
+        self.assertIsNone(state["stack"])
+
+    async def test_unparseable_dom_cards_fall_back_to_screenshot(self):
+        capture._FRAME_CACHE.clear()
+        page = AsyncDummyPage()
+        result = await capture.capture_state_from_dom(
+            mock.Mock(evaluate=mock.AsyncMock(return_value={"hero": ["As", None], "board": []})),
+            ".hero", ".board",
+        )
+        self.assertIsNone(result)
+        selectors = {"hero_selector": ".hero", "board_selector": ".board"}
+        with mock.patch.object(capture, "load_config_cached", return_value=selectors):
+            await capture.capture_state_from_playwright(page)
+        self.assertEqual(page.shot_kwargs["type"], "jpeg")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,13 @@
+import os
+import tempfile
+import unittest
 from pathlib import Path
+from unittest import mock
 
+import numpy as np
 from PIL import Image
 
-from vision import card_reader
+from vision import _nms_nb, card_reader
 
 ROOT = Path(__file__).resolve().parent
 
@@ -44,5 +49,369 @@ def run():
         print("No tests ran because no test images were found.")
 
 
+def _synthetic_scene():
+    """A gray frame with two distinct patterned glyphs pasted at known spots."""
+    rng = np.random.default_rng(11)
+    glyphs = {
+        "As": rng.integers(0, 256, size=(12, 9), dtype=np.uint8),
+        "Kd": rng.integers(0, 256, size=(12, 9), dtype=np.uint8),
+    }
+    frame = np.full((60, 80), 128, dtype=np.uint8)
+    frame[5:17, 10:19] = glyphs["As"]
+    frame[40:52, 50:59] = glyphs["Kd"]
+    return frame, glyphs
+
+
+def _patch_templates(pairs):
+    """Install (code, image) pairs as the loaded templates."""
+    return mock.patch.multiple(
+        card_reader.TemplateStore,
+        templates_loaded=True,
+        codes=[code for code, _ in pairs],
+        imgs=card_reader._stack_templates([img for _, img in pairs]),
+        binary_templates=[card_reader._binarize(img) for _, img in pairs] if card_reader.CV2_AVAILABLE else [],
+    )
+
+
+@unittest.skipUnless(card_reader.CV2_AVAILABLE, "OpenCV not installed")
+class MatchTemplatesTests(unittest.TestCase):
+    def setUp(self):
+        self.frame, glyphs = _synthetic_scene()
+        patcher = _patch_templates(list(glyphs.items()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_report_python_scalars_at_glyph_positions(self):
+        dets = card_reader._match_templates(self.frame, threshold=0.99)
+        self.assertEqual(
+            sorted((code, bbox) for code, _, bbox in dets),
+            [("As", (10, 5, 9, 12)), ("Kd", (50, 40, 9, 12))],
+        )
+        for _, score, bbox in dets:
+            self.assertIsInstance(score, float)
+            self.assertTrue(all(type(v) is int for v in bbox))
+
+    def test_cuda_path_scores_each_template_on_one_upload(self):
+        templates = card_reader.TemplateStore.get_templates()
+        uploads = []
+
+        def fake_frame_matcher(frame):
+            uploads.append(frame)
+            return lambda tmpl: card_reader.cv2.matchTemplate(frame, tmpl, card_reader.cv2.TM_CCOEFF_NORMED)
+
+        with mock.patch.object(card_reader, "CUDA_AVAILABLE", True), \
+                mock.patch.object(card_reader.TemplateStore, "gpu_templates", [t for _, t in templates]), \
+                mock.patch.object(card_reader, "_cuda_frame_matcher", fake_frame_matcher):
+            gpu_dets = card_reader._match_templates(self.frame, threshold=0.99)
+        self.assertEqual(len(uploads), 1)
+        self.assertEqual(gpu_dets, card_reader._match_templates(self.frame, threshold=0.99))
+
+    def test_cuda_match_error_falls_back_to_cpu(self):
+        templates = card_reader.TemplateStore.get_templates()
+
+        def failing_frame_matcher(frame):
+            def match(tmpl):
+                raise card_reader.cv2.error("out of device memory")
+            return match
+
+        with mock.patch.object(card_reader, "CUDA_AVAILABLE", True), \
+                mock.patch.object(card_reader.TemplateStore, "gpu_templates", [t for _, t in templates]), \
+                mock.patch.object(card_reader, "_cuda_frame_matcher", failing_frame_matcher), \
+                self.assertLogs(card_reader.logger, level="WARNING"):
+            dets = card_reader._match_templates(self.frame, threshold=0.99)
+        self.assertTrue(dets)
+        self.assertEqual(dets, card_reader._match_templates(self.frame, threshold=0.99))
+
+    def test_thread_pool_matches_serial_order(self):
+        with mock.patch.object(card_reader, "MATCH_WORKERS", 1):
+            serial = card_reader._match_templates(self.frame, threshold=0.5)
+
+        with mock.patch.object(card_reader, "MATCH_WORKERS", 4), \
+                mock.patch.object(card_reader, "_MATCH_POOL", None):
+            pooled = card_reader._match_templates(self.frame, threshold=0.5)
+            pool = card_reader._MATCH_POOL
+        self.addCleanup(pool.shutdown)
+
+        self.assertIsNotNone(pool)
+        self.assertEqual(pooled, serial)
+
+    def test_cpu_path_reuses_result_buffer(self):
+        with mock.patch.object(card_reader, "MATCH_WORKERS", 1):
+            first = card_reader._match_templates(self.frame, threshold=0.5)
+            buffer = card_reader._result_local.result
+            second = card_reader._match_templates(self.frame, threshold=0.5)
+        self.assertIs(card_reader._result_local.result, buffer)
+        self.assertEqual(buffer.shape, (49, 72))
+        self.assertEqual(first, second)
+
+    def test_binary_match_finds_glyphs(self):
+        with mock.patch.object(card_reader, "BINARY_MATCH", True), \
+                mock.patch.object(card_reader.cv2, "matchTemplate", wraps=card_reader.cv2.matchTemplate) as match:
+            dets = card_reader._nms(card_reader._match_templates(self.frame, threshold=0.95))
+        self.assertEqual({call.args[2] for call in match.call_args_list}, {card_reader.cv2.TM_SQDIFF})
+        self.assertEqual(
+            sorted((code, bbox) for code, _, bbox in dets),
+            [("As", (10, 5, 9, 12)), ("Kd", (50, 40, 9, 12))],
+        )
+        self.assertTrue(all(0.95 <= score <= 1.0 for _, score, _ in dets))
+
+
+def _reference_nms(dets, iou_threshold=0.3):
+    """The original pairwise Python NMS, kept as the behavioural spec."""
+    def iou(a, b):
+        ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+        iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+        inter = ix * iy
+        union = a[2] * a[3] + b[2] * b[3] - inter
+        return inter / union if inter and union > 0 else 0.0
+
+    pending = sorted(dets, key=lambda d: d[1], reverse=True)
+    kept = []
+    while pending:
+        best = pending.pop(0)
+        kept.append(best)
+        pending = [d for d in pending if iou(best[2], d[2]) < iou_threshold]
+    return kept
+
+
+class NmsTests(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(card_reader._nms([]), [])
+
+    def test_matches_reference_on_random_boxes(self):
+        rng = np.random.default_rng(21)
+        for _ in range(100):
+            n = int(rng.integers(1, 40))
+            dets = [
+                (
+                    f"c{i}",
+                    float(rng.choice([0.8, 0.85, 0.9, float(rng.random())])),
+                    tuple(int(v) for v in (rng.integers(0, 60), rng.integers(0, 60), rng.integers(0, 20), rng.integers(0, 20))),
+                )
+                for i in range(n)
+            ]
+            self.assertEqual(card_reader._nms(dets), _reference_nms(dets))
+
+    def test_loop_kernel_matches_vector_path(self):
+        rng = np.random.default_rng(22)
+        for _ in range(30):
+            n = int(rng.integers(1, 25))
+            boxes = np.column_stack([
+                rng.integers(0, 60, n), rng.integers(0, 60, n), rng.integers(0, 20, n), rng.integers(0, 20, n),
+            ]).astype(np.int32)
+            scores = rng.choice([0.8, 0.9, 0.95], size=n)
+            dets = [(f"c{i}", float(scores[i]), tuple(int(v) for v in boxes[i])) for i in range(n)]
+            order = np.argsort(-scores, kind="stable")
+            keep = _nms_nb._greedy_nms(boxes, order, 0.3).tolist()
+            with mock.patch.object(card_reader, "nms_numba", None):
+                self.assertEqual([dets[k] for k in keep], card_reader._nms(dets))
+                self.assertEqual(card_reader._nms_keep(dets), keep)
+
+    def test_soft_nms_keeps_border_overlap_and_drops_duplicates(self):
+        dets = [
+            ("As", 0.9, (0, 0, 40, 40)),
+            ("As", 0.85, (2, 0, 40, 40)),    # near-duplicate peak, IoU ~0.9
+            ("Kd", 0.88, (24, 0, 40, 40)),   # neighbouring slot, IoU ~0.25
+            ("7h", 0.2, (200, 0, 40, 40)),   # below score_threshold from the start
+        ]
+        self.assertEqual([d[0] for d in card_reader._nms(dets, iou_threshold=0.2)], ["As", "7h"])
+
+        soft = card_reader._nms(dets, sigma=0.5)
+        self.assertEqual([(code, bbox) for code, _, bbox in soft], [("As", (0, 0, 40, 40)), ("Kd", (24, 0, 40, 40))])
+        self.assertEqual(soft[0][1], 0.9)
+        self.assertLess(soft[1][1], 0.88)
+
+
+@unittest.skipUnless(card_reader.CV2_AVAILABLE, "OpenCV not installed")
+class PyramidMatchTests(unittest.TestCase):
+    @staticmethod
+    def _text_glyph(text):
+        cv2 = card_reader.cv2
+        tile = np.full((40, 40), 255, dtype=np.uint8)
+        cv2.putText(tile, text, (2, 27), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2, cv2.LINE_8)
+        return tile
+
+    def test_default_search_matches_exhaustive_search_on_text_glyphs(self):
+        templates = [(code, self._text_glyph(code)) for code in ("2c", "2d", "As")]
+        rng = np.random.default_rng(4)
+        scene = rng.integers(150, 200, size=(300, 400), dtype=np.uint8)
+        # Offsets off the 4x pyramid grid, where a coarse pass loses sharp glyphs.
+        scene[102:142, 102:142] = templates[0][1]
+        scene[33:73, 306:346] = templates[1][1]
+        scene[201:241, 25:65] = templates[2][1]
+
+        with mock.patch.object(card_reader, "PYRAMID_SCALE", 4):
+            small = [card_reader._downscale_template(t) for _, t in templates]
+        with _patch_templates(templates), \
+                mock.patch.object(card_reader.TemplateStore, "small_templates", small):
+            default = card_reader._match_templates(scene)
+            exhaustive = card_reader._match_templates(scene, use_pyramid=False)
+
+        self.assertEqual(default, exhaustive)
+        self.assertEqual(
+            sorted((code, bbox) for code, _, bbox in card_reader._nms(default)),
+            [("2c", (102, 102, 40, 40)), ("2d", (306, 33, 40, 40)), ("As", (25, 201, 40, 40))],
+        )
+
+
+class FindCardsCacheTests(unittest.TestCase):
+    def setUp(self):
+        card_reader._LAST_FRAME = None
+        self.addCleanup(setattr, card_reader, "_LAST_FRAME", None)
+        self.frame, _ = _synthetic_scene()
+
+    def test_hole_and_board_share_one_detection(self):
+        dets = [("As", 0.9, (10, 40, 9, 12)), ("Kd", 0.9, (10, 5, 9, 12)), ("7h", 0.9, (30, 5, 9, 12))]
+        with mock.patch.object(card_reader, "_match_templates", return_value=dets) as match:
+            hero = card_reader.detect_hole_cards(self.frame)
+            board = card_reader.detect_board_cards(self.frame)
+        self.assertEqual(match.call_count, 1)
+        self.assertEqual((board, hero), (["Kd", "7h"], ["As"]))
+
+    def test_changed_frame_or_templates_rerun_detection(self):
+        with mock.patch.object(card_reader, "_match_templates", return_value=[]) as match:
+            card_reader.find_cards(self.frame)
+            changed = self.frame.copy()
+            changed[0, 0] ^= 1
+            card_reader.find_cards(changed)
+            self.assertEqual(match.call_count, 2)
+            with mock.patch.object(card_reader.TemplateStore, "generation", card_reader.TemplateStore.generation + 1):
+                card_reader.find_cards(changed)
+        self.assertEqual(match.call_count, 3)
+
+
+@unittest.skipUnless(card_reader.CV2_AVAILABLE, "OpenCV not installed")
+class RegionRestrictionTests(unittest.TestCase):
+    def setUp(self):
+        card_reader._LAST_FRAME = None
+        self.addCleanup(setattr, card_reader, "_LAST_FRAME", None)
+        self.frame, glyphs = _synthetic_scene()
+        patcher = _patch_templates(list(glyphs.items()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_regions_report_frame_coordinates(self):
+        config = {
+            "board_region": {"x": 0, "y": 0, "w": 40, "h": 25},
+            "hero_region": {"x": 40, "y": 30, "w": 100, "h": 100},  # clipped to the frame
+        }
+        full = card_reader.find_cards(self.frame)
+        card_reader._LAST_FRAME = None
+        with mock.patch.object(card_reader, "_match_templates", wraps=card_reader._match_templates) as match:
+            restricted = card_reader.find_cards(self.frame, config=config)
+        self.assertEqual(sorted(restricted), sorted(full))
+        self.assertEqual([call.args[0].shape for call in match.call_args_list], [(30, 40), (25, 40)])
+
+    def test_cards_outside_regions_are_not_searched(self):
+        config = {"board_region": {"x": 0, "y": 0, "w": 40, "h": 25}}
+        self.assertEqual(card_reader.find_cards(self.frame, config=config), [("As", (10, 5, 9, 12))])
+        # Same pixels, different regions: the cached result must not be reused.
+        self.assertEqual(len(card_reader.find_cards(self.frame, config={})), 2)
+
+    def test_calibrated_slots_report_best_card_per_slot_without_nms(self):
+        config = {
+            "card_slot": {"w": 20, "h": 25, "x_spacing": 0},
+            "board_region": {"x": 0, "y": 0, "w": 40, "h": 25},
+            "board_slots": 2,
+            "hero_region": {"x": 40, "y": 30, "w": 20, "h": 25},
+            "hero_slots": 1,
+        }
+        with mock.patch.object(card_reader, "_nms_keep") as nms:
+            dets = card_reader.find_cards(self.frame, config=config)
+        nms.assert_not_called()
+        self.assertEqual(sorted(dets), [("As", (10, 5, 9, 12)), ("Kd", (50, 40, 9, 12))])
+
+
+@unittest.skipUnless(card_reader.CV2_AVAILABLE, "OpenCV not installed")
+class TemplateLoadTests(unittest.TestCase):
+    def test_flat_templates_are_rejected(self):
+        _, glyphs = _synthetic_scene()
+        with tempfile.TemporaryDirectory() as tmp:
+            Image.fromarray(glyphs["As"]).save(Path(tmp) / "As.png")
+            Image.new("L", (9, 12), color=255).save(Path(tmp) / "Kd.png")
+            with mock.patch.object(card_reader, "TEMPLATE_DIR", Path(tmp)), \
+                    mock.patch.object(card_reader.TemplateStore, "templates_loaded", False):
+                templates = card_reader.TemplateStore.get_templates()
+            card_reader.TemplateStore.templates_loaded = False
+        self.assertEqual([code for code, _ in templates], ["As"])
+
+    def test_bundle_skips_decodes_until_a_template_changes(self):
+        _, glyphs = _synthetic_scene()
+        with tempfile.TemporaryDirectory() as tmp:
+            for code, img in glyphs.items():
+                Image.fromarray(img).save(Path(tmp) / f"{code}.png")
+
+            def load():
+                with mock.patch.object(card_reader, "TEMPLATE_DIR", Path(tmp)), \
+                        mock.patch.object(card_reader.TemplateStore, "templates_loaded", False), \
+                        mock.patch.object(card_reader.cv2, "imread", wraps=card_reader.cv2.imread) as imread:
+                    codes, imgs = card_reader.TemplateStore.get_arrays()
+                card_reader.TemplateStore.templates_loaded = False
+                return codes, np.array(imgs), imread.call_count
+
+            first = load()
+            self.assertTrue((Path(tmp) / card_reader.TEMPLATE_BUNDLE_NAME).is_file())
+            second = load()
+            Image.fromarray(glyphs["As"][::-1].copy()).save(Path(tmp) / "As.png")
+            os.utime(Path(tmp) / "As.png", ns=(1, 1))
+            third = load()
+
+        self.assertEqual((first[0], first[2]), (["As", "Kd"], 2))
+        self.assertEqual((second[0], second[2]), (["As", "Kd"], 0))
+        np.testing.assert_array_equal(second[1], first[1])
+        self.assertEqual(third[2], 2)
+        np.testing.assert_array_equal(third[1][0], glyphs["As"][::-1])
+
+    def test_templates_attribute_forwards_to_the_store(self):
+        _, glyphs = _synthetic_scene()
+        with tempfile.TemporaryDirectory() as tmp:
+            for code, img in glyphs.items():
+                Image.fromarray(img).save(Path(tmp) / f"{code}.png")
+            with mock.patch.object(card_reader, "TEMPLATE_DIR", Path(tmp)), \
+                    mock.patch.object(card_reader.TemplateStore, "templates_loaded", False):
+                pairs = card_reader.TemplateStore.templates
+                module_pairs = card_reader.templates
+            card_reader.TemplateStore.templates_loaded = False
+        self.assertEqual([code for code, _ in pairs], ["As", "Kd"])
+        self.assertEqual([code for code, _ in module_pairs], ["As", "Kd"])
+        np.testing.assert_array_equal(pairs[1][1], glyphs["Kd"])
+        with self.assertRaises(AttributeError):
+            card_reader.TemplateStore.templates = []
+
+    def test_same_size_templates_are_stacked(self):
+        _, glyphs = _synthetic_scene()
+        stacked = card_reader._stack_templates(list(glyphs.values()))
+        self.assertEqual(stacked.shape, (2, 12, 9))
+        np.testing.assert_array_equal(stacked[1], glyphs["Kd"])
+        mixed = [glyphs["As"], glyphs["Kd"][:10]]
+        self.assertIs(card_reader._stack_templates(mixed), mixed)
+
+
+class GrayConversionTests(unittest.TestCase):
+    def test_gray_array_passes_through(self):
+        gray = np.zeros((4, 5), dtype=np.uint8)
+        self.assertIs(card_reader._pil_to_gray(gray), gray)
+
+    def test_gray_pil_image_is_not_reconverted(self):
+        image = Image.new("L", (6, 3), color=9)
+        with mock.patch.object(Image.Image, "convert") as convert:
+            gray = card_reader._pil_to_gray(image)
+        convert.assert_not_called()
+        self.assertEqual(gray.shape, (3, 6))
+        self.assertEqual(int(gray[0, 0]), 9)
+
+    def test_rgba_array_matches_rgb(self):
+        rgb = np.random.default_rng(6).integers(0, 256, size=(8, 10, 3), dtype=np.uint8)
+        rgba = np.dstack([rgb, np.full((8, 10), 255, dtype=np.uint8)])
+        np.testing.assert_array_equal(card_reader._pil_to_gray(rgba), card_reader._pil_to_gray(rgb))
+
+    def test_rgb_array_matches_pil_luma(self):
+        rgb = np.random.default_rng(5).integers(0, 256, size=(16, 24, 3), dtype=np.uint8)
+        expected = np.asarray(Image.fromarray(rgb).convert("L")).astype(int)
+        got = card_reader._pil_to_gray(rgb)
+        self.assertEqual(got.shape, (16, 24))
+        self.assertLessEqual(int(np.abs(got.astype(int) - expected).max()), 1)
+
+
 if __name__ == "__main__":
     run()
@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from vision import config
+
+
+class ConfigCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "vision_config.json"
+
+    def _write(self, data, mtime_ns):
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_reparses_only_when_mtime_changes(self):
+        self._write({"hero_slots": 3}, 1_000_000_000)
+        first = config.load_config_cached(self.path)
+        self.assertEqual(first["hero_slots"], 3)
+        self.assertIs(config.load_config_cached(self.path), first)
+
+        self._write({"hero_slots": 4}, 2_000_000_000)
+        second = config.load_config_cached(self.path)
+        self.assertEqual(second["hero_slots"], 4)
+        self.assertIsNot(second, first)
+
+    def test_missing_file_uses_defaults(self):
+        cfg = config.load_config_cached(self.path)
+        self.assertIsNone(cfg["hero_region"])
+        self.assertIs(config.load_config_cached(self.path), cfg)
+
+    def test_load_config_returns_independent_copies(self):
+        self._write({"card_slot": {"w": 30}}, 1_000_000_000)
+        first = config.load_config(self.path)
+        first["card_slot"]["w"] = 99
+        self.assertEqual(config.load_config(self.path)["card_slot"]["w"], 30)
+        self.assertEqual(config.load_config_cached(self.path)["card_slot"]["w"], 30)
+
+    def test_save_invalidates_cache(self):
+        self._write({}, 1_000_000_000)
+        cfg = config.load_config(self.path)
+        self.assertEqual(config.load_config_cached(self.path)["hero_slots"], 2)
+        cfg["hero_slots"] = 6
+        config.save_config(cfg, self.path)
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertEqual(config.load_config_cached(self.path)["hero_slots"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,18 @@ class DecisionTests(unittest.TestCase):
         action = decision.choose_action({"fold": 0.5, "call": 0.5})
         self.assertEqual(action, "call")  # tie-break priority: call > raise > fold
 
+    def test_choose_actions_matches_choose_action(self):
+        batch = [
+            {"fold": 0.1, "call": 0.7, "raise": 0.2},
+            {"fold": -1, "call": -2},
+            {"fold": 0.5, "call": 0.5},
+            {"fold": 0.5, "raise": 0.5},
+            {"fold": 0.6, "raise": 0.3},
+            {"raise": 0.9},
+        ]
+        self.assertEqual(decision.choose_actions(batch), [decision.choose_action(p) for p in batch])
+        self.assertEqual(decision.choose_actions([]), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,8 @@
+import json
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from solver import lookup
 
@@ -13,6 +17,51 @@ class LookupTests(unittest.TestCase):
         total = sum(probs.values())
         self.assertGreater(total, 0)
 
+    def test_cards_to_mask_accepts_common_spellings(self):
+        self.assertEqual(lookup.cards_to_mask(["As"]), lookup.cards_to_mask(["as"]))
+        self.assertEqual(lookup.cards_to_mask(["Th"]), lookup.cards_to_mask(["10h"]))
+        self.assertEqual(lookup.cards_to_mask(["??"]), 0)
+        self.assertTrue(lookup.cards_to_mask(["Kd", "ah"]) & lookup.ACE_MASK)
+        self.assertFalse(lookup.cards_to_mask(["Kd", "Qh"]) & lookup.ACE_MASK)
+
+    def test_lookup_strategy_branches(self):
+        ace = lookup.lookup_strategy({"hero_cards": ["ah", "2c"]})
+        postflop = lookup.lookup_strategy({"hero_cards": ["Kd", "Qh"], "board": ["2c", "7h", "Jh"]})
+        preflop = lookup.lookup_strategy({"hero_cards": ["Kd", "Qh"]})
+        self.assertEqual(max(ace, key=ace.get), "raise")
+        self.assertEqual(max(postflop, key=postflop.get), "call")
+        self.assertNotEqual(dict(postflop), dict(preflop))
+
+    def test_lookup_strategy_returns_shared_read_only_constants(self):
+        state = {"hero_cards": ["As", "Kd"], "board": []}
+        probs = lookup.lookup_strategy(state)
+        self.assertIs(probs, lookup._PROBS_ACE)
+        with self.assertRaises(TypeError):
+            probs["fold"] = 1.0  # type: ignore[index]
+
+    def test_lookup_strategy_is_memoized_per_bet_bucket(self):
+        lookup._lookup_cached.cache_clear()
+        state = {"hero_cards": ["Kd", "Qh"], "board": [], "bet_to_call": 10.0}
+        lookup.lookup_strategy(state)
+        lookup.lookup_strategy(dict(state, bet_to_call=10.5))  # same log2 bin
+        lookup.lookup_strategy(dict(state, bet_to_call=40.0))
+        info = lookup._lookup_cached.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+
+    def test_load_lookup_file_parses_and_caches(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "preflop.json").write_text(json.dumps({"AKs": {"raise": 1.0}}), encoding="utf-8")
+            (Path(tmp) / "empty.json").write_text("", encoding="utf-8")
+            lookup.load_lookup_file.cache_clear()
+            with mock.patch.object(lookup, "DATA_DIR", Path(tmp)):
+                table = lookup.load_lookup_file("preflop")
+                self.assertEqual(table, {"AKs": {"raise": 1.0}})
+                self.assertIs(lookup.load_lookup_file("preflop"), table)
+                self.assertEqual(lookup.load_lookup_file("empty"), {})
+                self.assertEqual(lookup.load_lookup_file("missing"), {})
+            lookup.load_lookup_file.cache_clear()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -23,6 +23,13 @@ class NormalizeStateTests(unittest.TestCase):
             state = normalize_state({"board": board})
             self.assertEqual(state.street, expected)
 
+    def test_card_lists_are_not_copied(self):
+        hero = ["As", "Kd"]
+        state = normalize_state({"hero_cards": hero, "board": ("2c", "7h", "Jh")})
+        self.assertIs(state.hero_cards, hero)
+        self.assertEqual(state.board, ["2c", "7h", "Jh"])
+        self.assertEqual(state.street, "flop")
+
 
 if __name__ == "__main__":
     unittest.main()
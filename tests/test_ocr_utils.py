@@ -0,0 +1,42 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from vision import ocr_utils
+
+
+class ReadTextFromRegionTests(unittest.TestCase):
+    def test_ndarray_region_is_a_view(self):
+        frame = np.zeros((40, 60), dtype=np.uint8)
+        frame[10:20, 5:25] = 255
+        with mock.patch.object(ocr_utils.pytesseract, "image_to_string", return_value="42") as ocr:
+            text = ocr_utils.read_text_from_region(frame, region=(5, 10, 20, 10))
+
+        self.assertEqual(text, "42")
+        passed = ocr.call_args.args[0]
+        self.assertIsInstance(passed, np.ndarray)
+        self.assertEqual(passed.shape, (10, 20))
+        self.assertTrue(np.shares_memory(passed, frame))
+        self.assertEqual(ocr.call_args.kwargs["config"], ocr_utils._DEFAULT_CFG)
+
+    def test_pil_region_matches_ndarray_region(self):
+        rgb = np.random.default_rng(0).integers(0, 256, (30, 40, 3), dtype=np.uint8)
+        with mock.patch.object(ocr_utils.pytesseract, "image_to_string", return_value="") as ocr:
+            ocr_utils.read_text_from_region(Image.fromarray(rgb), region=(3, 4, 10, 8))
+            ocr_utils.read_text_from_region(rgb, region=(3, 4, 10, 8))
+
+        from_pil, from_array = (call.args[0] for call in ocr.call_args_list)
+        np.testing.assert_array_equal(np.asarray(from_pil), from_array)
+
+    def test_tesseract_config_is_memoized(self):
+        self.assertIs(
+            ocr_utils.build_tesseract_config(psm=7),
+            ocr_utils.build_tesseract_config(psm=7),
+        )
+        self.assertEqual(ocr_utils._DEFAULT_CFG, "-l eng --oem 3 --psm 6")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from vision import capture, card_reader
+from vision._split import split_board_and_hero
+
+
+def _reference_split(detections):
+    """The original sorted()-based split, kept as the behavioural spec."""
+    if not detections:
+        return [], []
+    detections_sorted = sorted(detections, key=lambda d: d[1][1])
+    ys = [bbox[1] for _, bbox in detections_sorted]
+    median_y = sorted(ys)[len(ys) // 2]
+    board = [d for d in detections_sorted if d[1][1] <= median_y]
+    hero = [d for d in detections_sorted if d[1][1] > median_y]
+    return (
+        [code for code, _ in sorted(board, key=lambda d: d[1][0])],
+        [code for code, _ in sorted(hero, key=lambda d: d[1][0])],
+    )
+
+
+class SplitTests(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(split_board_and_hero([]), ([], []))
+
+    def test_board_above_hero_ordered_left_to_right(self):
+        detections = [
+            ("Kd", (160, 300, 40, 60)),
+            ("7h", (140, 100, 40, 60)),
+            ("As", (100, 300, 40, 60)),
+            ("2c", (100, 100, 40, 60)),
+            ("Jh", (180, 100, 40, 60)),
+        ]
+        self.assertEqual(split_board_and_hero(detections), (["2c", "7h", "Jh"], ["As", "Kd"]))
+
+    def test_matches_reference_on_random_layouts(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            n = rng.randint(1, 9)
+            detections = [
+                (f"c{i}", (rng.randrange(0, 50, 10), rng.randrange(0, 40, 10), 40, 60))
+                for i in range(n)
+            ]
+            self.assertEqual(split_board_and_hero(detections), _reference_split(detections))
+
+    def test_modules_share_one_implementation(self):
+        self.assertIs(capture._split_board_and_hero, split_board_and_hero)
+        self.assertIs(card_reader._split_board_and_hero, split_board_and_hero)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+vision/_nms_nb.py
+
+Greedy NMS as a typed double loop, compiled with numba when it is installed.
+
+card_reader._nms uses nms_numba when it is not None and otherwise keeps its
+NumPy implementation. The kernels are plain Python so they can be exercised
+(slowly) without numba.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore
+
+
+def _iou_pair(ax, ay, aw, ah, bx, by, bw, bh):
+    """IoU of two (x, y, w, h) boxes; 0.0 when they do not overlap."""
+    inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+    inter_h = min(ay + ah, by + bh) - max(ay, by)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = float(inter_w) * float(inter_h)
+    union = float(aw) * float(ah) + float(bw) * float(bh) - inter
+    if union <= 0.0:
+        return 0.0
+    return inter / union
+
+
+def _greedy_nms(boxes, order, iou_threshold):
+    """
+    Indices of boxes kept by greedy NMS, in keep order.
+
+    boxes is (n, 4) int32 (x, y, w, h) and order the indices by descending
+    score. A box survives while its IoU with every kept box stays strictly
+    below iou_threshold, matching card_reader._nms.
+    """
+    n = order.shape[0]
+    suppressed = np.zeros(n, dtype=np.bool_)
+    keep = np.empty(n, dtype=np.int64)
+    count = 0
+    for a in range(n):
+        if suppressed[a]:
+            continue
+        i = order[a]
+        keep[count] = i
+        count += 1
+        for b in range(a + 1, n):
+            if suppressed[b]:
+                continue
+            j = order[b]
+            iou = iou_pair(
+                boxes[i, 0], boxes[i, 1], boxes[i, 2], boxes[i, 3],
+                boxes[j, 0], boxes[j, 1], boxes[j, 2], boxes[j, 3],
+            )
+            if iou >= iou_threshold:
+                suppressed[b] = True
+    return keep[:count]
+
+
+if njit is not None:  # pragma: no cover - depends on numba being installed
+    iou_pair = njit(cache=True)(_iou_pair)
+    nms_numba = njit(cache=True)(_greedy_nms)
+else:
+    iou_pair = _iou_pair
+    nms_numba = None
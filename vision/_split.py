@@ -0,0 +1,48 @@
+"""
+vision/_split.py
+
+Detection type and the canonical board/hero row split shared by capture.py
+and card_reader.py.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Detection = (card_code, (x, y, w, h))
+Detection = Tuple[str, Tuple[int, int, int, int]]
+
+
+def split_board_and_hero(detections: Sequence[Detection]) -> Tuple[List[str], List[str]]:
+    """
+    Split detected cards into board and hero cards based on vertical position.
+
+    Assumptions:
+      - Board cards are visually above hero cards on the screen.
+      - Both sets of cards are roughly in horizontal rows.
+
+    Strategy:
+      1. Use the median y (upper median for even counts) as a separator line.
+      2. Cards above or equal to that line are "board", below are "hero".
+      3. Within each group, order left-to-right by x (ties by y, then input
+         order).
+
+    All coordinates go through one (n, 2) array, so each frame costs a few
+    vectorized ops instead of several lambda-keyed sorts; the median is an
+    O(n) np.partition select rather than a full sort.
+    """
+    if not detections:
+        return [], []
+
+    coords = np.asarray([bbox[:2] for _, bbox in detections], dtype=np.int32)
+    xs, ys = coords[:, 0], coords[:, 1]
+    k = len(ys) // 2
+    median_y = np.partition(ys, k)[k]
+    is_board = ys <= median_y
+
+    def ordered_codes(mask: np.ndarray) -> List[str]:
+        idx = np.flatnonzero(mask)
+        idx = idx[np.lexsort((ys[idx], xs[idx]))]
+        return [detections[i][0] for i in idx.tolist()]
+
+    return ordered_codes(is_board), ordered_codes(~is_board)
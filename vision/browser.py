@@ -0,0 +1,84 @@
+"""
+vision/browser.py
+
+Process-wide persistent Chromium used by the calibration CLI.
+
+Launching a browser costs seconds; a persistent context launched once keeps
+its HTTP cache, cookies and compiled JS on disk under USER_DATA_DIR, so repeat
+captures only navigate and screenshot. Avoid page.route() on this context:
+intercepting requests disables the browser HTTP cache.
+"""
+from __future__ import annotations
+
+import atexit
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:  # pragma: no cover - optional dependency
+    sync_playwright = None  # type: ignore
+
+USER_DATA_DIR = Path("~/.cache/poker-vision").expanduser()
+DEFAULT_VIEWPORT = (1200, 800)
+
+# (playwright, context, page, launch_key) of the live session, if any.
+_SESSION: Optional[Tuple[Any, Any, Any, Tuple[bool, Tuple[int, int]]]] = None
+
+
+def get_page(
+    headless: bool = True,
+    viewport: Tuple[int, int] = DEFAULT_VIEWPORT,
+) -> Tuple[Any, Any, Any]:
+    """
+    Return (browser, context, page) from the cached persistent session.
+
+    The context is launched on first use and reused afterwards; asking for a
+    different headless/viewport combination relaunches it. browser is
+    context.browser, which Playwright may report as None for persistent
+    contexts.
+    """
+    global _SESSION
+    if sync_playwright is None:
+        raise RuntimeError("playwright is not installed; install it to capture screenshots")
+
+    key = (bool(headless), (int(viewport[0]), int(viewport[1])))
+    if _SESSION is not None and _SESSION[3] != key:
+        _shutdown()
+
+    if _SESSION is None:
+        playwright = sync_playwright().start()
+        try:
+            USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
+            context = playwright.chromium.launch_persistent_context(
+                str(USER_DATA_DIR),
+                headless=key[0],
+                viewport={"width": key[1][0], "height": key[1][1]},
+            )
+        except Exception:
+            playwright.stop()
+            raise
+        page = context.pages[0] if context.pages else context.new_page()
+        _SESSION = (playwright, context, page, key)
+
+    playwright, context, page, key = _SESSION
+    if page.is_closed():
+        page = context.new_page()
+        _SESSION = (playwright, context, page, key)
+    return context.browser, context, page
+
+
+def _shutdown() -> None:
+    """Close the persistent context and stop Playwright (registered atexit)."""
+    global _SESSION
+    if _SESSION is None:
+        return
+    playwright, context, _, _ = _SESSION
+    _SESSION = None
+    try:
+        context.close()
+    finally:
+        playwright.stop()
+
+
+atexit.register(_shutdown)
@@ -13,18 +13,16 @@ Usage examples:
 from __future__ import annotations
 
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw
 
-try:
-    from playwright.sync_api import sync_playwright
-except ImportError:  # pragma: no cover - optional dependency
-    sync_playwright = None  # type: ignore
-
-from . import capture
-from .config import DEFAULT_CONFIG_PATH, get_region, load_config, save_config
+from . import browser, capture
+from .config import DEFAULT_CONFIG_PATH, get_region, load_config, save_config, slot_boxes as _slot_boxes
 
 REGION_KEYS = {
     "hero_region",
@@ -52,6 +50,12 @@ def _parse_viewport(value: str) -> Tuple[int, int]:
     return int(parts[0]), int(parts[1])
 
 
+def _save_image(image: Image.Image, path: Path) -> None:
+    """Save a PIL Image to disk, ensuring parent directories exist."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path)
+
+
 def _parse_cards(value: Optional[str]) -> List[str]:
     if not value:
         return []
@@ -59,35 +63,6 @@ def _parse_cards(value: Optional[str]) -> List[str]:
     return [p.strip() for p in parts if p.strip()]
 
 
-def _slot_boxes(
-    region: Tuple[int, int, int, int],
-    count: int,
-    slot_cfg: Dict[str, Any],
-) -> List[Tuple[int, int, int, int]]:
-    x, y, w, h = region
-    slot_w = slot_cfg.get("w")
-    slot_h = slot_cfg.get("h")
-    x_spacing = int(slot_cfg.get("x_spacing", 0) or 0)
-    y_spacing = int(slot_cfg.get("y_spacing", 0) or 0)
-
-    boxes: List[Tuple[int, int, int, int]] = []
-
-    if slot_w and slot_h:
-        cur_x = x
-        for _ in range(count):
-            boxes.append((cur_x, y, int(slot_w), int(slot_h)))
-            cur_x += int(slot_w) + x_spacing
-        return boxes
-
-    slot_w = int(w / max(count, 1))
-    slot_h = h
-    for i in range(count):
-        boxes.append((x + i * slot_w, y, slot_w, slot_h))
-    if y_spacing:
-        boxes = [(bx, by + y_spacing, bw, bh - y_spacing) for bx, by, bw, bh in boxes]
-    return boxes
-
-
 def _corner_crop(config: Dict[str, Any]) -> Tuple[int, int, int, int]:
     corner = config.get("corner_crop") or {}
     x = int(corner.get("x", 0) or 0)
@@ -99,26 +74,15 @@ def _corner_crop(config: Dict[str, Any]) -> Tuple[int, int, int, int]:
     return x, y, w, h
 
 
-def _save_image(image: Image.Image, path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    image.save(path)
-
-
 def cmd_capture(args: argparse.Namespace) -> None:
-    if sync_playwright is None:
-        raise RuntimeError("playwright is not installed; install it to capture screenshots")
-
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
-    viewport_w, viewport_h = _parse_viewport(args.viewport)
+    viewport = _parse_viewport(args.viewport)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=args.headless)
-        page = browser.new_page(viewport={"width": viewport_w, "height": viewport_h})
-        page.goto(args.url)
-        page.wait_for_timeout(args.wait_ms)
-        image = capture.screenshot_page(page)
-        browser.close()
+    _, _, page = browser.get_page(headless=args.headless, viewport=viewport)
+    page.goto(args.url)
+    page.wait_for_timeout(args.wait_ms)
+    image = capture.screenshot_page(page)
 
     path = out_dir / "screenshot.png"
     _save_image(image, path)
@@ -173,6 +137,59 @@ def cmd_preview(args: argparse.Namespace) -> None:
     print(f"Wrote preview to {out_path}")
 
 
+# ITU-R 601 luma weights in 16-bit fixed point, rounded the way PIL's
+# convert("L") does, so templates match frames converted by card_reader.
+_LUMA_WEIGHTS = np.array([19595, 38470, 7471], dtype=np.uint32)
+
+
+def _to_gray(rgb: np.ndarray) -> np.ndarray:
+    """Convert (..., 3) uint8 RGB to uint8 luma in one vectorized pass."""
+    return ((rgb.astype(np.uint32) @ _LUMA_WEIGHTS + 0x8000) >> 16).astype(np.uint8)
+
+
+def _gather_corners(
+    frame: np.ndarray,
+    boxes: List[Tuple[int, int, int, int]],
+    corner: Tuple[int, int, int, int],
+) -> np.ndarray:
+    """
+    Stack every slot's corner crop into one (N, ch, cw, 3) array.
+
+    Pixels outside the frame come back black, as with PIL's crop.
+    """
+    cx, cy, cw, ch = corner
+    origins = np.array([(x + cx, y + cy) for x, y, _, _ in boxes], dtype=np.int64).reshape(-1, 2)
+    pad_lo = max(0, -int(origins.min(initial=0)))
+    pad_x = max(0, int((origins[:, 0] + cw).max(initial=0)) - frame.shape[1])
+    pad_y = max(0, int((origins[:, 1] + ch).max(initial=0)) - frame.shape[0])
+    if pad_lo or pad_x or pad_y:
+        frame = np.pad(frame, ((pad_lo, pad_y), (pad_lo, pad_x), (0, 0)))
+        origins = origins + pad_lo
+
+    out = np.empty((len(origins), ch, cw, 3), dtype=np.uint8)
+    for i, (x, y) in enumerate(origins.tolist()):
+        out[i] = frame[y:y + ch, x:x + cw]
+    return out
+
+
+def _save_png(path: Path, pixels: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Level 1 encodes several times faster than the default 6; tiny corner
+    # glyphs barely compress further anyway.
+    Image.fromarray(pixels).save(path, "PNG", optimize=False, compress_level=1)
+
+
+def _write_pngs(items: List[Tuple[Path, np.ndarray]]) -> None:
+    """Encode and write PNGs in parallel; zlib releases the GIL while compressing."""
+    if len(items) < 2:
+        for path, pixels in items:
+            _save_png(path, pixels)
+        return
+    with ThreadPoolExecutor(max_workers=min(len(items), os.cpu_count() or 1)) as pool:
+        # list() re-raises the first write error, if any.
+        list(pool.map(lambda item: _save_png(*item), items))
+
+
 def _emit_templates(
     image: Image.Image,
     region: Tuple[int, int, int, int],
@@ -185,21 +202,39 @@ def _emit_templates(
 ) -> None:
     slot_cfg = config.get("card_slot") or {}
     boxes = _slot_boxes(region, len(cards), slot_cfg)
-    cx, cy, cw, ch = _corner_crop(config)
-
+    if not boxes:
+        return
+
+    frame = np.asarray(image.convert("RGB"))
+    corners = _to_gray(_gather_corners(frame, boxes, _corner_crop(config)))
+
+    writes: List[Tuple[Path, np.ndarray]] = []
+    templates: List[Path] = []
+    # Position in writes of each queued template, so a card code repeated in
+    # cards is written once (writes run in parallel and must not share a
+    # path). Same outcome as writing serially: the last corner wins with
+    # overwrite, the first otherwise.
+    queued: Dict[Path, int] = {}
     for idx, (card, box) in enumerate(zip(cards, boxes)):
-        x, y, w, h = box
-        slot_crop = image.crop((x, y, x + w, y + h))
         if dump_slots:
-            slot_path = out_dir / "slots" / f"{prefix}_{idx}.png"
-            _save_image(slot_crop, slot_path)
+            writes.append((out_dir / "slots" / f"{prefix}_{idx}.png", capture.crop_region(frame, box)))
 
-        corner = slot_crop.crop((cx, cy, cx + cw, cy + ch)).convert("L")
         out_path = out_dir / f"{card}.png"
+        if out_path in queued:
+            if overwrite:
+                writes[queued[out_path]] = (out_path, corners[idx])
+            else:
+                print(f"Skipping existing template {out_path}")
+            continue
         if out_path.exists() and not overwrite:
             print(f"Skipping existing template {out_path}")
             continue
-        _save_image(corner, out_path)
+        queued[out_path] = len(writes)
+        writes.append((out_path, corners[idx]))
+        templates.append(out_path)
+
+    _write_pngs(writes)
+    for out_path in templates:
         print(f"Wrote template {out_path}")
 
 
@@ -4,30 +4,119 @@ vision/capture.py
 Responsible for:
   - Taking a screenshot from a Playwright page
   - Running card detection on that screenshot
+  - Reading numeric fields (pot, stack, bet_to_call) from the DOM
   - Packaging the result into a raw dictionary that main.py can normalize
 
-Numeric fields such as pot, stack, and bet_to_call are left as None for now.
-You can later extend this file to call OCR helpers to populate those values.
+Numeric fields are read from the DOM elements in META_SELECTORS when the
+table renders them; otherwise they stay None. You can later extend this
+file to call OCR helpers for tables that only expose pixels.
+
+Live frames are decoded straight to numpy arrays, with pyvips when it is
+installed (optional, faster SIMD decoders) and PIL otherwise.
 """
 
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import asyncio
+import hashlib
 import io
+import itertools
 import logging
+import re
+import threading
 import time
+import weakref
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
+try:
+    import pyvips
+except (ImportError, OSError):  # pragma: no cover - optional fast decoder
+    pyvips = None  # type: ignore
+
 from . import card_reader
-from .config import get_region, load_config
+from ._split import Detection, split_board_and_hero as _split_board_and_hero
+from .config import get_region, load_config_cached
+
+# A decoded frame: PIL Image, or HxWx3 uint8 RGB array on the live path.
+Frame = Union[Image.Image, np.ndarray]
 
-# Detection = (card_code, (x, y, w, h))
-Detection = Tuple[str, Tuple[int, int, int, int]]
+# Live detection frames are JPEG: far cheaper to encode/decode than PNG and
+# quality 85 keeps rank/suit corners well above the match threshold.
+DETECTION_IMAGE_FORMAT = "jpeg"
+DETECTION_JPEG_QUALITY = 85
+
+# Detection results for recently seen frames, keyed by a hash of the encoded
+# screenshot plus its clip origin, the resolved regions, the template
+# generation and the slot calibration (see _frame_cache_key). Small and LRU so
+# several tables can each keep their last frame.
+FRAME_CACHE_SIZE = 8
+_FRAME_CACHE: "OrderedDict[Tuple, Dict]" = OrderedDict()
 
 # Optional static fallbacks; prefer DOM-derived regions when available.
 HERO_REGION_FALLBACK: Optional[Tuple[int, int, int, int]] = None
 BOARD_REGION_FALLBACK: Optional[Tuple[int, int, int, int]] = None
 
+# DOM selectors for numeric table fields; missing elements leave the value None.
+META_SELECTORS: Dict[str, str] = {
+    "pot": "#pot",
+    "stack": "#stack",
+    "bet_to_call": "#bet_to_call",
+}
+
+_READ_TEXTS_JS = """
+(selectors) => {
+  const out = {};
+  for (const [key, sel] of Object.entries(selectors)) {
+    const el = document.querySelector(sel);
+    out[key] = el ? el.textContent : null;
+  }
+  return out;
+}
+"""
+
+# DOM elements whose bounding boxes stand in for unconfigured card regions.
+REGION_SELECTORS = {"hero_region": "#hero", "board_region": "#board"}
+
+_READ_BOXES_JS = """
+(selectors) => {
+  const out = {};
+  for (const [key, sel] of Object.entries(selectors)) {
+    const el = document.querySelector(sel);
+    if (!el) { out[key] = null; continue; }
+    const r = el.getBoundingClientRect();
+    out[key] = {x: r.x, y: r.y, width: r.width, height: r.height};
+  }
+  return out;
+}
+"""
+
+# page -> (url, boxes) so DOM boxes are re-read only after a navigation.
+_DOM_BOX_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+_READ_DOM_STATE_JS = """
+(args) => {
+  const parse = el => el.dataset.card
+    || ((el.getAttribute("class") || "").match(/(?:^|\\s)card-([a-z0-9]{2,3})(?:\\s|$)/i) || [])[1]
+    || null;
+  const cards = sel => Array.from(document.querySelectorAll(sel), parse);
+  const texts = {};
+  for (const [key, sel] of Object.entries(args.meta)) {
+    const el = document.querySelector(sel);
+    texts[key] = el ? el.textContent : null;
+  }
+  return {hero: cards(args.hero), board: cards(args.board), texts};
+}
+"""
+
+_CARD_RANKS = "23456789TJQKA"
+_CARD_SUITS = "cdhs"
+
+_AMOUNT_RE = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,40 +124,197 @@ class CaptureError(RuntimeError):
     """Raised when a screenshot cannot be taken or parsed."""
 
 
-def screenshot_page(page, region: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+def _ensure_page_ready(page) -> None:
+    if page is None or getattr(page, "is_closed", lambda: True)():
+        raise CaptureError("Cannot capture screenshot: page is not ready or already closed")
+
+
+def _decode_screenshot(data: bytes) -> Image.Image:
+    """Decode PNG/JPEG screenshot bytes into an RGB PIL Image."""
+    try:
+        return Image.open(io.BytesIO(data)).convert("RGB")
+    except Exception as exc:
+        raise CaptureError(f"Failed to decode screenshot into image: {exc}") from exc
+
+
+def _decode_gray(data: bytes) -> np.ndarray:
+    """
+    Decode PNG/JPEG screenshot bytes straight into an HxW uint8 luma array.
+
+    Card templates are grayscale, so detection never needs the colour
+    planes: this is a third of the memory and copy bandwidth of an RGB
+    decode. Both paths produce Rec.601 luma (0.299 R + 0.587 G + 0.114 B),
+    the gray space templates are cut in: PIL's direct RGB(A)->L conversion,
+    or with pyvips an sRGB decode recombined with the same weights. (vips'
+    "b-w" colourspace is gamma-corrected luminance and would not match.)
+    """
+    if pyvips is None:
+        try:
+            return np.asarray(Image.open(io.BytesIO(data)).convert("L"))
+        except Exception as exc:
+            raise CaptureError(f"Failed to decode screenshot into image: {exc}") from exc
+    try:
+        vi = pyvips.Image.new_from_buffer(data, "", access="sequential")
+        if vi.hasalpha():
+            vi = vi.extract_band(0, n=vi.bands - 1)
+        if vi.bands != 1:
+            if vi.bands != 3:
+                vi = vi.colourspace("srgb")
+            # +0.5 so the uchar cast rounds like PIL instead of truncating.
+            vi = vi.recomb([[0.299, 0.587, 0.114]]).linear(1, 0.5).cast("uchar")
+        return np.ndarray(buffer=vi.write_to_memory(), dtype=np.uint8, shape=(vi.height, vi.width))
+    except Exception as exc:
+        raise CaptureError(f"Failed to decode screenshot into image: {exc}") from exc
+
+
+def _screenshot_options(
+    image_format: str,
+    quality: Optional[int],
+    region: Optional[Tuple[int, int, int, int]],
+) -> Dict:
+    """
+    Build page.screenshot kwargs. A region becomes a clip rectangle so that
+    Chromium only encodes (and we only decode) the pixels we need.
+    """
+    options: Dict = {"full_page": True, "type": image_format}
+    if image_format == "jpeg" and quality is not None:
+        options["quality"] = quality
+    if region:
+        x, y, w, h = region
+        options["clip"] = {"x": x, "y": y, "width": w, "height": h}
+    return options
+
+
+def screenshot_page(
+    page,
+    region: Optional[Tuple[int, int, int, int]] = None,
+    image_format: str = "png",
+    quality: int = DETECTION_JPEG_QUALITY,
+) -> Image.Image:
     """
     Take a screenshot of the Playwright page and return a PIL Image.
 
     Parameters:
-      page   - Playwright page
-      region - optional (x, y, w, h) to crop after capture
+      page         - Playwright page (sync API)
+      region       - optional (x, y, w, h); only this rectangle is captured
+      image_format - "png" (default, lossless: use for calibration) or "jpeg"
+      quality      - JPEG quality, ignored for PNG
 
     Raises CaptureError if the page is closed or screenshot fails.
     """
-    if page is None or getattr(page, "is_closed", lambda: True)():
-        raise CaptureError("Cannot capture screenshot: page is not ready or already closed")
+    _ensure_page_ready(page)
 
     try:
-        png_bytes = page.screenshot(full_page=True)
+        data = page.screenshot(**_screenshot_options(image_format, quality, region))
     except Exception as exc:
         raise CaptureError(f"Failed to take screenshot: {exc}") from exc
 
+    return _decode_screenshot(data)
+
+
+async def _screenshot_bytes_async(
+    page,
+    image_format: str = DETECTION_IMAGE_FORMAT,
+    quality: int = DETECTION_JPEG_QUALITY,
+    region: Optional[Tuple[int, int, int, int]] = None,
+) -> bytes:
+    """Take a screenshot with the async API and return the encoded bytes."""
+    _ensure_page_ready(page)
+
     try:
-        image = Image.open(io.BytesIO(png_bytes)).convert("RGB")
+        return await page.screenshot(**_screenshot_options(image_format, quality, region))
     except Exception as exc:
-        raise CaptureError(f"Failed to decode screenshot into image: {exc}") from exc
+        raise CaptureError(f"Failed to take screenshot: {exc}") from exc
+
+
+def frame_digest(data: bytes) -> bytes:
+    """Cheap 64-bit fingerprint of encoded screenshot bytes."""
+    return hashlib.blake2b(data, digest_size=8).digest()
 
-    if region:
-        image = crop_region(image, region)
 
-    return image
+async def screenshot_hash(page) -> bytes:
+    """
+    Fingerprint the current detection frame without decoding it.
+
+    Lets callers skip work when the table has not visibly changed.
+    """
+    return frame_digest(await _screenshot_bytes_async(page))
+
+
+def _copy_state(state: Dict) -> Dict:
+    """Copy a state dict and its list values, so callers may mutate card lists."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in state.items()}
+
+
+def _frame_cache_key(data: bytes, origin: Tuple[int, int], regions: Dict) -> Tuple:
+    """
+    _FRAME_CACHE key: identical bytes only reuse a result while everything
+    else detection depends on is unchanged too.
+    """
+    card_reader.TemplateStore.get_arrays()  # load first so the key has the live generation
+    config = load_config_cached()
+    slot_key = repr((config.get("card_slot"), config.get("hero_slots"), config.get("board_slots")))
+    return (
+        card_reader.TemplateStore.generation,
+        slot_key,
+        tuple(sorted(regions.items())),
+        frame_digest(data),
+        origin,
+    )
+
+
+def _remember_frame(key: Tuple, state: Dict) -> None:
+    _FRAME_CACHE[key] = _copy_state(state)
+    _FRAME_CACHE.move_to_end(key)
+    while len(_FRAME_CACHE) > FRAME_CACHE_SIZE:
+        _FRAME_CACHE.popitem(last=False)
+
+
+# Per-region detection results keyed by (template generation, region key, slot
+# config, crop shape, crop digest).
+# Hero cards usually sit still for a whole hand while the pot and board
+# change, so their template match is reused even when the full frame differs.
+# Filled from worker threads, hence the lock.
+REGION_CACHE_SIZE = 1024
+_REGION_CACHE: "OrderedDict[Tuple, List[Detection]]" = OrderedDict()
+_REGION_CACHE_LOCK = threading.Lock()
+
+# Regions detected one by one when known; each crop's cards land in its field.
+DETECTION_REGIONS = (("hero_region", "hero_cards"), ("board_region", "board"))
+
+
+# Regions whose pixels the live capture needs; their union is the screenshot clip.
+CAPTURE_REGION_KEYS = ("hero_region", "board_region", "pot_region", "stack_region", "bet_to_call_region")
+
+
+def _union_region(regions: List[Optional[Tuple[int, int, int, int]]]) -> Optional[Tuple[int, int, int, int]]:
+    """Smallest (x, y, w, h) covering every given region; None if there are none."""
+    boxes = [r for r in regions if r]
+    if not boxes:
+        return None
+    x1 = min(x for x, _, _, _ in boxes)
+    y1 = min(y for _, y, _, _ in boxes)
+    x2 = max(x + w for x, _, w, _ in boxes)
+    y2 = max(y + h for _, y, _, h in boxes)
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def _shift_region(region: Tuple[int, int, int, int], dx: int, dy: int) -> Tuple[int, int, int, int]:
+    x, y, w, h = region
+    return (x + dx, y + dy, w, h)
 
 
-def crop_region(image: Image.Image, region: Tuple[int, int, int, int]) -> Image.Image:
+def crop_region(image: Frame, region: Tuple[int, int, int, int]) -> Frame:
     """
-    Crop a PIL Image to the given region (x, y, w, h).
+    Crop a frame to the given region (x, y, w, h).
+
+    numpy frames return a zero-copy view clipped to the frame bounds; wrap it
+    in np.ascontiguousarray only where a consumer needs owned memory. PIL
+    images still return a PIL crop.
     """
     x, y, w, h = region
+    if isinstance(image, np.ndarray):
+        return image[max(y, 0):y + h, max(x, 0):x + w]
     return image.crop((x, y, x + w, y + h))
 
 
@@ -85,46 +331,38 @@ def get_table_region(page, region: Tuple[int, int, int, int]) -> Image.Image:
     return screenshot_page(page, region=region)
 
 
-def _split_board_and_hero(detections: List[Detection]) -> Tuple[List[str], List[str]]:
+def _pil_to_ndarray(image: Frame) -> np.ndarray:
     """
-    Split detected cards into board and hero cards based on vertical position.
+    Return the frame as a uint8 array for card_reader; arrays pass through.
 
-    Assumptions:
-      - Board cards are visually above hero cards on the screen.
-      - Both sets of cards are roughly in horizontal rows.
-
-    Strategy:
-      1. Sort detections by y coordinate.
-      2. Use the median y as a rough separator line.
-      3. Cards above or equal to that line are "board", below are "hero".
-      4. Within each group, sort by x for left-to-right ordering.
+    PIL images are materialized once (as RGB unless already RGB or L), so
+    find_cards never round-trips a frame through PIL itself.
     """
-    if not detections:
-        return [], []
-
-    detections_sorted = sorted(detections, key=lambda d: d[1][1])
-
-    ys = [bbox[1] for _, bbox in detections_sorted]
-    median_y = sorted(ys)[len(ys) // 2]
-
-    board: List[Detection] = []
-    hero: List[Detection] = []
-
-    for code, (x, y, w, h) in detections_sorted:
-        if y <= median_y:
-            board.append((code, (x, y, w, h)))
-        else:
-            hero.append((code, (x, y, w, h)))
-
-    board_sorted = [code for code, bbox in sorted(board, key=lambda d: d[1][0])]
-    hero_sorted = [code for code, bbox in sorted(hero, key=lambda d: d[1][0])]
-
-    return board_sorted, hero_sorted
+    if isinstance(image, np.ndarray):
+        return image
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    return np.asarray(image)
+
+
+def _blank_state() -> Dict:
+    """A raw state with the keys main.normalize_state expects and no cards."""
+    return {
+        "hero_cards": [],
+        "board": [],
+        "raw_detections": [],
+        # Filled from META_SELECTORS DOM text by capture_meta_from_dom /
+        # capture_state_from_dom; stay None when the table does not render them.
+        "pot": None,
+        "to_act": "hero",
+        "stack": None,
+        "bet_to_call": None,
+    }
 
 
-def _capture_state_from_image(image: Image.Image) -> Dict:
+def _capture_state_from_image(image: Frame) -> Dict:
     """
-    Core implementation that works off a PIL image.
+    Core implementation that works off a PIL image or an RGB numpy array.
 
     This allows:
       - Playwright based capture
@@ -133,55 +371,152 @@ def _capture_state_from_image(image: Image.Image) -> Dict:
     Returns a raw dictionary with the keys that main.normalize_state expects.
     Numeric fields are currently left as None until OCR is wired in.
     """
-    detections: List[Detection] = card_reader.find_cards(image)
+    detections: List[Detection] = card_reader.find_cards(_pil_to_ndarray(image))
 
     board_codes, hero_codes = _split_board_and_hero(detections)
 
-    state: Dict = {
-        "hero_cards": hero_codes,
-        "board": board_codes,
-        "raw_detections": detections,
-        # The following are intentionally None for now.
-        # TODO: use OCR to fill these once you have stable regions and ocr_utils.
-        "pot": None,
-        "to_act": "hero",
-        "stack": None,
-        "bet_to_call": None,
-    }
+    state = _blank_state()
+    state.update(hero_cards=hero_codes, board=board_codes, raw_detections=detections)
     return state
 
 
-def _get_bounding_box(page, selector: str) -> Optional[Tuple[int, int, int, int]]:
+def _slot_config(key: str, region: Tuple[int, int, int, int]) -> Optional[Dict]:
     """
-    Return a bounding box (x, y, w, h) for a DOM element, if available.
+    find_cards config for slot matching inside one region crop, or None.
+
+    Only returned once card_slot w/h are calibrated: region is the card
+    region in crop coordinates, so find_cards lays the hero_slots/board_slots
+    slots out over the crop and reports the best card per slot.
     """
-    if not hasattr(page, "query_selector"):
+    config = load_config_cached()
+    slot_cfg = config.get("card_slot") or {}
+    if not (slot_cfg.get("w") and slot_cfg.get("h")):
         return None
-    try:
-        elem = page.query_selector(selector)
-        if elem is None:
-            return None
-        box = elem.bounding_box()
-        if not box:
-            return None
-        return (
-            int(box.get("x", 0)),
-            int(box.get("y", 0)),
-            int(box.get("width", 0)),
-            int(box.get("height", 0)),
-        )
-    except Exception as exc:  # pragma: no cover - depends on Playwright runtime
-        logger.debug("Failed to get bounding box for %s: %s", selector, exc)
+    count_key = card_reader.CARD_SLOT_COUNT_KEYS[key]
+    x, y, w, h = region
+    return {
+        "card_slot": slot_cfg,
+        key: {"x": x, "y": y, "w": w, "h": h},
+        count_key: config.get(count_key),
+    }
+
+
+def _detect_region(key: str, crop: np.ndarray, slot_config: Optional[Dict] = None) -> List[Detection]:
+    """
+    find_cards on one region crop, memoized on the crop's pixel digest.
+
+    The template generation is part of the key, so a TemplateStore reload
+    never serves detections made with the old templates; so is slot_config,
+    so recalibrating slots does too.
+    """
+    crop = np.ascontiguousarray(crop)
+    card_reader.TemplateStore.get_arrays()  # load first so the key has the live generation
+    slot_key = repr(sorted(slot_config.items())) if slot_config else None
+    cache_key = (card_reader.TemplateStore.generation, key, slot_key, crop.shape, frame_digest(crop))
+    with _REGION_CACHE_LOCK:
+        cached = _REGION_CACHE.get(cache_key)
+        if cached is not None:
+            _REGION_CACHE.move_to_end(cache_key)
+            return cached
+    if slot_config:
+        detections = card_reader.find_cards(crop, config=slot_config)
+    else:
+        detections = card_reader.find_cards(crop)
+    with _REGION_CACHE_LOCK:
+        _REGION_CACHE[cache_key] = detections
+        while len(_REGION_CACHE) > REGION_CACHE_SIZE:
+            _REGION_CACHE.popitem(last=False)
+    return detections
+
+
+def _capture_state_from_regions(image: Frame, regions: Dict, origin: Tuple[int, int] = (0, 0)) -> Dict:
+    """
+    Like _capture_state_from_image, but match templates only inside the hero
+    and board regions, each through the per-region cache.
+
+    Cards are assigned by the region they were found in rather than by the
+    median-y split, and raw_detections are reported in page coordinates.
+    Once card_slot w/h are calibrated, each crop is searched slot by slot
+    (card_reader._match_slots) instead of with a full search plus NMS.
+    """
+    frame = _pil_to_ndarray(image)
+    ox, oy = origin
+    state = _blank_state()
+    raw: List[Detection] = []
+    for region_key, field in DETECTION_REGIONS:
+        x, y, w, h = _shift_region(regions[region_key], -ox, -oy)
+        crop = crop_region(frame, (x, y, w, h))
+        # The crop starts at (max(x, 0), max(y, 0)); slots keep their offset
+        # when the region hangs off the frame edge.
+        slot_config = _slot_config(region_key, (min(x, 0), min(y, 0), w, h))
+        found = _detect_region(region_key, crop, slot_config) if crop.size else []
+        dx, dy = max(x, 0) + ox, max(y, 0) + oy
+        shifted = [(code, (bx + dx, by + dy, bw, bh)) for code, (bx, by, bw, bh) in found]
+        state[field] = [code for code, _ in sorted(shifted, key=lambda d: (d[1][0], d[1][1]))]
+        raw.extend(shifted)
+    state["raw_detections"] = raw
+    return state
+
+
+def _box_to_region(box) -> Optional[Tuple[int, int, int, int]]:
+    if not box:
         return None
+    return (
+        int(box.get("x", 0)),
+        int(box.get("y", 0)),
+        int(box.get("width", 0)),
+        int(box.get("height", 0)),
+    )
 
 
-def _resolve_regions(page) -> Dict[str, Optional[Tuple[int, int, int, int]]]:
+async def _get_dom_boxes(page) -> Dict[str, Optional[Tuple[int, int, int, int]]]:
+    """
+    Return REGION_SELECTORS bounding boxes (x, y, w, h) from one page.evaluate.
+
+    Complete results are cached per page until page.url changes. Missing
+    elements and DOM failures map to None.
+    """
+    url = getattr(page, "url", None)
+    try:
+        cached = _DOM_BOX_CACHE.get(page)
+    except TypeError:  # page type not weak-referenceable
+        cached = None
+    if cached is not None and cached[0] == url:
+        return cached[1]
+
+    boxes: Dict[str, Optional[Tuple[int, int, int, int]]] = {key: None for key in REGION_SELECTORS}
+    if not hasattr(page, "evaluate"):
+        return boxes
+    try:
+        raw = await page.evaluate(_READ_BOXES_JS, REGION_SELECTORS)
+    except Exception as exc:  # pragma: no cover - depends on Playwright runtime
+        logger.debug("Failed to read region boxes from DOM: %s", exc)
+        return boxes
+    if isinstance(raw, dict):
+        for key in boxes:
+            boxes[key] = _box_to_region(raw.get(key))
+    if all(boxes.values()):
+        # Only cache complete layouts; a missing element may still render.
+        try:
+            _DOM_BOX_CACHE[page] = (url, boxes)
+        except TypeError:
+            pass
+    return boxes
+
+
+async def _resolve_regions(page) -> Dict[str, Optional[Tuple[int, int, int, int]]]:
     """
     Find hero/board regions, preferring config -> DOM -> fallbacks.
     """
-    config = load_config()
-    hero_region = get_region(config, "hero_region") or _get_bounding_box(page, "#hero") or HERO_REGION_FALLBACK
-    board_region = get_region(config, "board_region") or _get_bounding_box(page, "#board") or BOARD_REGION_FALLBACK
+    config = load_config_cached()
+    hero_region = get_region(config, "hero_region")
+    board_region = get_region(config, "board_region")
+    if not (hero_region and board_region):
+        dom_boxes = await _get_dom_boxes(page)
+        hero_region = hero_region or dom_boxes["hero_region"]
+        board_region = board_region or dom_boxes["board_region"]
+    hero_region = hero_region or HERO_REGION_FALLBACK
+    board_region = board_region or BOARD_REGION_FALLBACK
     regions: Dict[str, Optional[Tuple[int, int, int, int]]] = {
         "hero_region": hero_region,
         "board_region": board_region,
@@ -193,53 +528,331 @@ def _resolve_regions(page) -> Dict[str, Optional[Tuple[int, int, int, int]]]:
     return regions
 
 
-def _save_image(image: Image.Image, path: Path) -> None:
-    """Save a PIL Image to disk, ensuring parent directories exist."""
+# Debug dumps are encoded and written off the capture path, in order, by one
+# background thread. Names come from a per-process counter (plus the start
+# time, so separate runs do not overwrite each other) instead of a clock read
+# per frame.
+_DUMP_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-dump")
+_DUMP_COUNTER = itertools.count()
+_DUMP_SESSION = int(time.time())
+
+
+def _write_dump(pixels: np.ndarray, path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    image.save(path)
+    Image.fromarray(pixels).save(path, "PNG", compress_level=1)
+
+
+def _log_dump_failure(future: Future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Failed to write debug dump: %s", exc)
+
+
+def flush_dumps() -> None:
+    """Block until every queued debug dump has been written."""
+    _DUMP_WRITER.submit(lambda: None).result()
 
 
-def capture_state_from_playwright(page, dump_dir: Optional[str] = None) -> Dict:
+def _dump_frames(
+    image: Frame,
+    regions: Dict,
+    dump_dir: str,
+    origin: Tuple[int, int] = (0, 0),
+) -> Dict[str, str]:
     """
-    Capture and parse table state from a Playwright page.
+    Queue the frame plus hero/board crops for writing; return their paths.
 
-    Steps:
-      1. Take a PNG screenshot of the full page.
-      2. Convert the screenshot into a PIL Image.
-      3. Run card detection and packaging via _capture_state_from_image.
+    Files appear once the background writer gets to them; call
+    flush_dumps() to wait. origin is the page position of the frame's
+    top-left pixel when the screenshot was clipped; regions are in page
+    coordinates.
+    """
+    # Crops below are views into this one array rather than fresh PIL images.
+    frame = np.asarray(image)
+    stem = f"frame_{_DUMP_SESSION}_{next(_DUMP_COUNTER):06d}"
+    dump_path = Path(dump_dir)
+    ox, oy = origin
+
+    writes = {"screenshot_path": (frame, dump_path / f"{stem}.png")}
+    for key, region_key, suffix in (
+        ("hero_crop_path", "hero_region", "hero"),
+        ("board_crop_path", "board_region", "board"),
+    ):
+        region = regions.get(region_key)
+        if region:
+            crop = crop_region(frame, _shift_region(region, -ox, -oy))
+            writes[key] = (crop, dump_path / f"{stem}_{suffix}.png")
+
+    paths: Dict[str, str] = {}
+    for key, (pixels, path) in writes.items():
+        _DUMP_WRITER.submit(_write_dump, pixels, path).add_done_callback(_log_dump_failure)
+        paths[key] = str(path)
+    return paths
+
+
+def _parse_amount(text: Optional[str]) -> Optional[float]:
+    """Parse the first number in a UI string such as "$1,250.50"; None if absent."""
+    if not text:
+        return None
+    match = _AMOUNT_RE.search(text)
+    if not match:
+        return None
+    return float(match.group(0).replace(",", ""))
 
-    This function is the entry point used by main.run_single_decision_step.
+
+async def capture_meta_from_dom(page) -> Dict[str, Optional[float]]:
     """
-    image = screenshot_page(page)
-    regions = _resolve_regions(page)
+    Read pot/stack/bet_to_call text from the DOM in one page.evaluate call.
+
+    Returns a dict with every META_SELECTORS key; values are None when the
+    element is missing or holds no number. DOM failures are logged and
+    treated as "no data" so they never break a capture.
+    """
+    meta: Dict[str, Optional[float]] = {key: None for key in META_SELECTORS}
+    try:
+        texts = await page.evaluate(_READ_TEXTS_JS, META_SELECTORS)
+    except Exception as exc:  # pragma: no cover - depends on Playwright runtime
+        logger.debug("Failed to read table meta from DOM: %s", exc)
+        return meta
+    if isinstance(texts, dict):
+        for key in meta:
+            meta[key] = _parse_amount(texts.get(key))
+    return meta
+
+
+def _normalize_card_code(raw) -> Optional[str]:
+    """Turn DOM card labels such as "as", "AS" or "10h" into "As"/"Th"; None if invalid."""
+    if not isinstance(raw, str):
+        return None
+    code = raw.strip()
+    if code[:2] == "10":
+        code = "T" + code[2:]
+    if len(code) != 2:
+        return None
+    rank, suit = code[0].upper(), code[1].lower()
+    if rank not in _CARD_RANKS or suit not in _CARD_SUITS:
+        return None
+    return rank + suit
+
+
+async def capture_state_from_dom(page, hero_selector: str, board_selector: str) -> Optional[Dict]:
+    """
+    Read hero/board cards and table meta straight from the DOM.
+
+    For sites that render cards as elements, this single page.evaluate
+    replaces screenshot, decode and template matching. Each element matched
+    by the selectors must carry its code as data-card="As" or a class such as
+    "card-as". Returns None when the DOM read fails or any element cannot be
+    parsed, so the caller can fall back to the screenshot path.
+    """
+    try:
+        raw = await page.evaluate(
+            _READ_DOM_STATE_JS,
+            {"hero": hero_selector, "board": board_selector, "meta": META_SELECTORS},
+        )
+    except Exception as exc:  # pragma: no cover - depends on Playwright runtime
+        logger.debug("Failed to read cards from DOM: %s", exc)
+        return None
+    if not isinstance(raw, dict):
+        return None
+
+    hero = [_normalize_card_code(code) for code in raw.get("hero") or []]
+    board = [_normalize_card_code(code) for code in raw.get("board") or []]
+    if not hero or None in hero or None in board:
+        return None
+
+    texts = raw.get("texts") or {}
+    state = _blank_state()
+    state.update(hero_cards=hero, board=board)
+    return _merge_meta(state, {key: _parse_amount(texts.get(key)) for key in META_SELECTORS})
+
+
+def _decode_and_detect(data: bytes, origin: Tuple[int, int], regions: Optional[Dict] = None) -> Dict:
+    image = _decode_gray(data)
+    if regions and all(regions.get(key) for key, _ in DETECTION_REGIONS):
+        return _capture_state_from_regions(image, regions, origin)
     state = _capture_state_from_image(image)
+    ox, oy = origin
+    if ox or oy:
+        # Report detections in page coordinates, not clip coordinates.
+        state["raw_detections"] = [(code, _shift_region(bbox, ox, oy)) for code, bbox in state["raw_detections"]]
+    return state
+
+
+# (regions, clip, clip origin, encoded screenshot bytes) from _grab_frame.
+_RawFrame = Tuple[Dict, Optional[Tuple[int, int, int, int]], Tuple[int, int], bytes]
+
+
+async def _grab_frame(page) -> _RawFrame:
+    """
+    Resolve regions and take the (clipped) detection screenshot.
+
+    The clip is only applied when both card regions are known, widened to
+    cover the meta regions too; otherwise the full page is captured so
+    find_cards can still search the whole table.
+    """
+    regions = await _resolve_regions(page)
+    clip = None
+    if all(regions.get(key) for key, _ in DETECTION_REGIONS):
+        clip = _union_region([regions.get(key) for key in CAPTURE_REGION_KEYS])
+    origin = (clip[0], clip[1]) if clip else (0, 0)
+    data = await _screenshot_bytes_async(page, region=clip)
+    return regions, clip, origin, data
+
+
+async def _detect_frame(page, frame: _RawFrame, dump_dir: Optional[str] = None) -> Dict:
+    """Turn grabbed screenshot bytes into a state dict (cache, decode, detect, dump)."""
+    regions, clip, origin, data = frame
+    key = _frame_cache_key(data, origin, regions)
+
+    cached = _FRAME_CACHE.get(key)
+    if cached is not None:
+        _FRAME_CACHE.move_to_end(key)
+        state = _copy_state(cached)
+        state.update(regions)
+        return state
+
+    state = await asyncio.to_thread(_decode_and_detect, data, origin, regions)
+    _remember_frame(key, state)
     state.update(regions)
 
     if dump_dir:
-        timestamp = int(time.time() * 1000)
-        dump_path = Path(dump_dir)
-
-        screenshot_path = dump_path / f"frame_{timestamp}.png"
-        _save_image(image, screenshot_path)
-        state["screenshot_path"] = str(screenshot_path)
-
-        hero_region = regions.get("hero_region")
-        if hero_region:
-            hero_crop = crop_region(image, hero_region)
-            hero_path = dump_path / f"frame_{timestamp}_hero.png"
-            _save_image(hero_crop, hero_path)
-            state["hero_crop_path"] = str(hero_path)
-
-        board_region = regions.get("board_region")
-        if board_region:
-            board_crop = crop_region(image, board_region)
-            board_path = dump_path / f"frame_{timestamp}_board.png"
-            _save_image(board_crop, board_path)
-            state["board_crop_path"] = str(board_path)
+        # Archive a lossless colour copy: dumped frames are reused for
+        # template extraction, which must not inherit JPEG artifacts, and the
+        # detection frame above was decoded to grayscale only.
+        if DETECTION_IMAGE_FORMAT != "png":
+            data = await _screenshot_bytes_async(page, "png", region=clip)
+        image = await asyncio.to_thread(_decode_screenshot, data)
+        state.update(_dump_frames(image, regions, dump_dir, origin))
 
     return state
 
 
+def _merge_meta(state: Dict, meta: Dict[str, Optional[float]]) -> Dict:
+    for key, value in meta.items():
+        if value is not None:
+            state[key] = value
+    return state
+
+
+async def capture_cards_from_screenshot(page, dump_dir: Optional[str] = None) -> Dict:
+    """
+    Screenshot the page and run card detection on it.
+
+    Regions are resolved first; when both hero and board regions are known
+    the screenshot is clipped to the union of all known regions, so Chromium
+    encodes and we decode only those pixels. Otherwise the full page is
+    captured.
+
+    Frames are fingerprinted before decoding; when the bytes match a
+    recently seen frame, the cached detection result is reused and decode,
+    detection and debug dumps are skipped entirely. Detection runs on a
+    grayscale decode of a JPEG frame; debug dumps take an extra lossless
+    PNG of the same clip. New frames are decoded, detected and dumped in
+    worker threads so that several pages can be driven concurrently from
+    one event loop.
+    """
+    return await _detect_frame(page, await _grab_frame(page), dump_dir)
+
+
+async def capture_state_from_playwright(page, dump_dir: Optional[str] = None) -> Dict:
+    """
+    Capture and parse table state from a Playwright page (async API).
+
+    Steps (1 and 2 run concurrently):
+      1. Screenshot the page and detect cards (capture_cards_from_screenshot).
+      2. Read pot/stack/bet_to_call from the DOM (capture_meta_from_dom).
+      3. Merge DOM values over the screenshot state where available.
+
+    When the config sets hero_selector and board_selector, cards are first
+    read from the DOM (capture_state_from_dom) and the screenshot is skipped;
+    the steps above run only if that read comes back empty or unparseable.
+
+    This function is the entry point used by main.run_single_decision_step.
+    """
+    config = load_config_cached()
+    hero_selector = config.get("hero_selector")
+    board_selector = config.get("board_selector")
+    if hero_selector and board_selector:
+        state = await capture_state_from_dom(page, hero_selector, board_selector)
+        if state is not None:
+            return state
+
+    state, meta = await asyncio.gather(
+        capture_cards_from_screenshot(page, dump_dir=dump_dir),
+        capture_meta_from_dom(page),
+    )
+    return _merge_meta(state, meta)
+
+
+def _discard(task: "asyncio.Future") -> None:
+    """Drop a prefetch task without leaving an unretrieved exception behind."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
+class CaptureLoop:
+    """
+    Pipelined capture for continuous observation of one page.
+
+    Each next_state() call starts the following screenshot (and DOM meta
+    read) before detecting the current frame, so the CDP round-trip of frame
+    N+1 overlaps detection of frame N in the worker thread.
+
+    A prefetched frame predates whatever the caller does with the returned
+    state; call invalidate() after acting on the page (e.g. clicking) so the
+    next state comes from a fresh screenshot.
+
+    Usage:
+        async with CaptureLoop(page) as loop:
+            while watching:
+                state = await loop.next_state()
+    """
+
+    def __init__(self, page, dump_dir: Optional[str] = None) -> None:
+        self.page = page
+        self.dump_dir = dump_dir
+        self._next: Optional[asyncio.Future] = None
+
+    async def _grab(self) -> Tuple[_RawFrame, Dict[str, Optional[float]]]:
+        frame, meta = await asyncio.gather(_grab_frame(self.page), capture_meta_from_dom(self.page))
+        return frame, meta
+
+    async def next_state(self) -> Dict:
+        """Return the next state, prefetching the screenshot after it."""
+        pending, self._next = self._next, None
+        frame, meta = await (pending if pending is not None else self._grab())
+        self._next = asyncio.ensure_future(self._grab())
+        state = await _detect_frame(self.page, frame, self.dump_dir)
+        return _merge_meta(state, meta)
+
+    def invalidate(self) -> None:
+        """Throw away the prefetched frame, e.g. after clicking an action."""
+        if self._next is not None:
+            _discard(self._next)
+            self._next = None
+
+    async def aclose(self) -> None:
+        self.invalidate()
+
+    async def __aenter__(self) -> "CaptureLoop":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+
+def warmup() -> None:
+    """
+    Pay first-call costs up front: load card templates and push one blank
+    frame through detection so later captures start warm.
+    """
+    card_reader.TemplateStore.get_arrays()
+    _capture_state_from_image(Image.new("RGB", (64, 64)))
+
+
 def capture_state_from_image(image: Image.Image) -> Dict:
     """
     Public helper for offline testing.
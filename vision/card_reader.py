@@ -16,13 +16,21 @@ Runtime behavior:
     This allows you to run the pipeline before templates are ready.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import hashlib
 import logging
+import os
+import threading
 
 import numpy as np
 from PIL import Image
 
+from ._nms_nb import nms_numba
+from ._split import Detection, split_board_and_hero as _split_board_and_hero
+from .config import get_region, slot_boxes
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -32,27 +40,109 @@ except ImportError:
     cv2 = None  # type: ignore
     CV2_AVAILABLE = False
 
-# Detection = (card_code, (x, y, w, h))
-Detection = Tuple[str, Tuple[int, int, int, int]]
+
+def _cuda_device_count() -> int:
+    if not CV2_AVAILABLE or not hasattr(cv2, "cuda"):
+        return 0
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount()
+    except Exception:  # pragma: no cover - depends on the OpenCV build
+        return 0
+
+
+# True when OpenCV was built with CUDA and sees a device; matching then runs
+# on the GPU with the frame uploaded once for all templates.
+CUDA_AVAILABLE = _cuda_device_count() > 0
+
+# Templates whose pixel standard deviation is below this are rejected at load:
+# TM_CCOEFF_NORMED scores a flat template 1.0 at every position, flooding NMS
+# with false matches.
+MIN_TEMPLATE_STD = 1.0
+
+# Opt-in coarse-to-fine search: with PYRAMID_SCALE > 1 (e.g. 4) templates are
+# first matched on a 1/PYRAMID_SCALE frame with a relaxed threshold, then
+# scored at full resolution only in windows around the coarse hits. Templates
+# whose downscaled copy would be smaller than PYRAMID_MIN_TEMPLATE pixels on a
+# side are matched at full resolution directly. Off by default: sharp text
+# glyphs (rank/suit corners) lose most of their NCC when downsampled, so an
+# exact full-resolution match can fall below the coarse gate and be missed.
+# Only enable it for templates verified to survive downscaling; set it before
+# templates load, since the small copies are built then.
+PYRAMID_SCALE = 1
+PYRAMID_MIN_TEMPLATE = 8
+COARSE_THRESHOLD_MARGIN = 0.15
+
+# Threads used to run CPU template correlations concurrently; 1 matches
+# templates serially on the calling thread.
+MATCH_WORKERS = os.cpu_count() or 1
+_MATCH_POOL: Optional[ThreadPoolExecutor] = None
+_MATCH_POOL_LOCK = threading.Lock()
+
+# Opt-in fast path for high-contrast card templates: binarize frame and
+# templates at BINARY_THRESHOLD and match with plain TM_SQDIFF, about twice
+# as fast as TM_CCOEFF_NORMED on the CPU. The score becomes the fraction of
+# template pixels that agree, so thresholds need retuning (0.9-0.95 rather
+# than 0.8). Replaces the pyramid search; the CUDA path keeps NCC. The cut is
+# fixed rather than Otsu: per-image Otsu on a full frame is dominated by the
+# table felt and would not binarize cards the way it binarized the templates.
+BINARY_MATCH = False
+BINARY_THRESHOLD = 127
+
+# Per-thread GPU state (matcher, stream, frame buffer): several tables may run
+# detection concurrently in worker threads.
+_cuda_local = threading.local()
+# Per-thread CPU matchTemplate output buffers (see _result_buffers).
+_result_local = threading.local()
+
+# Config regions find_cards restricts matching to when a config is passed.
+CARD_REGION_KEYS = ("hero_region", "board_region")
+# Slot-count key for each card region; used once card_slot w/h are calibrated.
+CARD_SLOT_COUNT_KEYS = {"hero_region": "hero_slots", "board_region": "board_slots"}
 
 # Project root is assumed to be one level up from this file's parent:
 #   <project_root> / vision / card_reader.py
 ROOT_DIR = Path(__file__).resolve().parents[1]
 TEMPLATE_DIR = ROOT_DIR / "data" / "templates"
+TEMPLATE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+# Decoded templates cached next to the images so later processes skip the
+# per-file PNG decodes. Rebuilt whenever the listing (names, sizes, mtimes)
+# differs from the one recorded in the bundle.
+TEMPLATE_BUNDLE_NAME = "_bundle.npz"
+
+
+class _TemplateStoreMeta(type):
+    @property
+    def templates(cls) -> List[Tuple[str, np.ndarray]]:
+        """
+        Read-only (card_code, image) pairs, kept for callers of the old attribute.
+        """
+        return cls.get_templates()
 
 
-class TemplateStore:
+class TemplateStore(metaclass=_TemplateStoreMeta):
     """
     Lazy loader for card templates.
 
     Templates are loaded once on first access, then cached in memory.
 
-    Each entry in templates is a tuple:
-      (card_code, template_image_gray)
+    Storage is two parallel sequences: codes[i] is the card code of the
+    grayscale template imgs[i]. When every template has the same shape, imgs
+    is one stacked (N, th, tw) array; otherwise it is a list of arrays.
+    get_templates() still returns (card_code, template_image_gray) pairs.
     """
 
     templates_loaded: bool = False
-    templates: List[Tuple[str, np.ndarray]] = []
+    codes: List[str] = []
+    imgs: Union[np.ndarray, List[np.ndarray]] = []
+    # Bumped on every (re)load so cached detections never outlive their templates.
+    generation: int = 0
+    # cv2.cuda_GpuMat copies of templates, same order, when CUDA_AVAILABLE.
+    gpu_templates: List[Any] = []
+    # 1/PYRAMID_SCALE copies for the coarse search, same order; None where the
+    # template would shrink below PYRAMID_MIN_TEMPLATE.
+    small_templates: List[Optional[np.ndarray]] = []
+    # Binarized (0/255) copies for BINARY_MATCH, same order.
+    binary_templates: List[np.ndarray] = []
 
     @classmethod
     def _load_templates(cls) -> None:
@@ -63,7 +153,12 @@ class TemplateStore:
           - If TEMPLATE_DIR does not exist, it simply records an empty list.
           - If individual files cannot be read, they are skipped.
         """
-        cls.templates = []
+        cls.generation += 1
+        cls.codes = []
+        cls.imgs = []
+        cls.gpu_templates = []
+        cls.small_templates = []
+        cls.binary_templates = []
 
         if not CV2_AVAILABLE:
             logger.info("OpenCV not available, card detection disabled")
@@ -75,48 +170,289 @@ class TemplateStore:
             cls.templates_loaded = True
             return
 
-        for path in TEMPLATE_DIR.iterdir():
-            if not path.is_file():
-                continue
-            if path.suffix.lower() not in {".png", ".jpg", ".jpeg"}:
-                continue
-
-            img = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
-            if img is None:
-                continue
+        files = sorted(
+            path for path in TEMPLATE_DIR.iterdir()
+            if path.is_file() and path.suffix.lower() in TEMPLATE_SUFFIXES
+        )
+        stamp = _listing_stamp(files)
+        bundled = _read_bundle(stamp)
+        if bundled is not None:
+            codes, imgs = bundled
+        else:
+            codes, imgs = _decode_templates(files)
+            _write_bundle(codes, imgs, stamp)
 
-            code = path.stem  # for example "As", "Kd", "2c"
-            cls.templates.append((code, img))
+        cls.codes = codes
+        cls.imgs = imgs if isinstance(imgs, np.ndarray) else _stack_templates(imgs)
+        if CUDA_AVAILABLE:
+            cls.gpu_templates = [_upload_to_gpu(img) for img in imgs]
+        cls.small_templates = [_downscale_template(img) for img in imgs]
+        cls.binary_templates = [_binarize(img) for img in imgs]
 
         cls.templates_loaded = True
-        logger.info("%s templates loaded%s", len(cls.templates), "" if cls.templates else " (card detection disabled)")
+        logger.info("%s templates loaded%s", len(codes), "" if codes else " (card detection disabled)")
 
     @classmethod
-    def get_templates(cls) -> List[Tuple[str, np.ndarray]]:
+    def get_arrays(cls) -> Tuple[List[str], Union[np.ndarray, List[np.ndarray]]]:
         """
-        Return the list of loaded templates, loading them on first use.
+        Return (codes, imgs) of the loaded templates, loading them on first use.
         """
         if not cls.templates_loaded:
             cls._load_templates()
-        return cls.templates
+        return cls.codes, cls.imgs
+
+    @classmethod
+    def get_templates(cls) -> List[Tuple[str, np.ndarray]]:
+        """
+        Return the loaded templates as (card_code, image) pairs, loading them on first use.
+        """
+        codes, imgs = cls.get_arrays()
+        return list(zip(codes, imgs))
+
+
+def __getattr__(name: str) -> Any:
+    # card_reader.templates forwards to the store like TemplateStore.templates.
+    if name == "templates":
+        return TemplateStore.get_templates()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def _pil_to_gray(image: Image.Image) -> np.ndarray:
+def _decode_templates(files: List[Path]) -> Tuple[List[str], List[np.ndarray]]:
+    codes: List[str] = []
+    imgs: List[np.ndarray] = []
+    for path in files:
+        img = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+
+        code = path.stem  # for example "As", "Kd", "2c"
+        if not _has_contrast(img):
+            logger.warning("Skipping template %s: no contrast to correlate against", path.name)
+            continue
+        codes.append(code)
+        imgs.append(img)
+    return codes, imgs
+
+
+def _listing_stamp(files: List[Path]) -> List[str]:
+    """One "name:size:mtime_ns" entry per template file, in load order."""
+    stamp = []
+    for path in files:
+        st = path.stat()
+        stamp.append(f"{path.name}:{st.st_size}:{st.st_mtime_ns}")
+    return stamp
+
+
+def _read_bundle(stamp: List[str]) -> Optional[Tuple[List[str], np.ndarray]]:
+    """(codes, stacked imgs) from the bundle if it was built from this listing."""
+    bundle = TEMPLATE_DIR / TEMPLATE_BUNDLE_NAME
+    if not stamp or not bundle.is_file():
+        return None
+    try:
+        with np.load(bundle, allow_pickle=False) as data:
+            if data["stamp"].tolist() != stamp:
+                return None
+            return data["codes"].tolist(), data["imgs"]
+    except Exception as exc:
+        logger.debug("Ignoring unreadable template bundle %s: %s", bundle, exc)
+        return None
+
+
+def _write_bundle(codes: List[str], imgs: List[np.ndarray], stamp: List[str]) -> None:
+    """Best effort: only same-size template sets are bundled, and write errors are ignored."""
+    stacked = _stack_templates(imgs)
+    if not isinstance(stacked, np.ndarray):
+        return
+    bundle = TEMPLATE_DIR / TEMPLATE_BUNDLE_NAME
+    tmp = bundle.with_name(bundle.name + ".tmp")
+    try:
+        with open(tmp, "wb") as handle:
+            np.savez(handle, codes=np.array(codes, dtype=str), imgs=stacked, stamp=np.array(stamp, dtype=str))
+        os.replace(tmp, bundle)
+    except OSError as exc:
+        logger.debug("Could not write template bundle %s: %s", bundle, exc)
+
+
+def _stack_templates(imgs: List[np.ndarray]) -> Union[np.ndarray, List[np.ndarray]]:
+    """One (N, th, tw) array when all templates share a shape, else the list itself."""
+    if imgs and all(img.shape == imgs[0].shape for img in imgs):
+        return np.stack(imgs)
+    return imgs
+
+
+# Channel count -> cvtColor code for RGB(A) frames.
+_CVT_TO_GRAY = {3: cv2.COLOR_RGB2GRAY, 4: cv2.COLOR_RGBA2GRAY} if CV2_AVAILABLE else {}
+
+
+def _pil_to_gray(image: Union[Image.Image, np.ndarray]) -> np.ndarray:
     """
-    Convert a PIL Image to a grayscale numpy array suitable for OpenCV.
+    Convert a PIL Image or numpy frame to a grayscale array suitable for OpenCV.
 
-    If 'image' is already a numpy array, it is wrapped into a PIL Image first
-    to normalize the conversion behavior.
+    numpy input is used as-is: 2-D arrays are already grayscale and HxWx3/4
+    RGB(A) arrays go through one cv2.cvtColor, with no PIL round-trip. PIL
+    input is converted only if it is not already "L", and exposed with
+    np.asarray since matching only reads it.
     """
-    if not isinstance(image, Image.Image):
+    if isinstance(image, np.ndarray):
+        if image.ndim == 2:
+            return image
+        if CV2_AVAILABLE and image.ndim == 3 and image.shape[2] in _CVT_TO_GRAY:
+            return cv2.cvtColor(image, _CVT_TO_GRAY[image.shape[2]])
         image = Image.fromarray(image)
-    image = image.convert("L")
-    return np.array(image)
+    if image.mode != "L":
+        image = image.convert("L")
+    return np.asarray(image)
+
+
+def _has_contrast(tmpl: np.ndarray) -> bool:
+    _, std = cv2.meanStdDev(tmpl)
+    return float(std[0][0]) >= MIN_TEMPLATE_STD
+
+
+def _binarize(gray: np.ndarray) -> np.ndarray:
+    _, binary = cv2.threshold(gray, BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
+    return binary
+
+
+def _downscale_template(tmpl: np.ndarray) -> Optional[np.ndarray]:
+    th, tw = tmpl.shape[:2]
+    if PYRAMID_SCALE <= 1 or min(th, tw) // PYRAMID_SCALE < PYRAMID_MIN_TEMPLATE:
+        return None
+    return cv2.resize(tmpl, (tw // PYRAMID_SCALE, th // PYRAMID_SCALE), interpolation=cv2.INTER_AREA)
+
+
+def _coarse_to_fine(
+    image_gray: np.ndarray,
+    gray_small: np.ndarray,
+    tmpl: np.ndarray,
+    tmpl_small: np.ndarray,
+    threshold: float,
+) -> List[Tuple[int, int, float]]:
+    """
+    Full-resolution (x, y, score) peaks of tmpl, searched only near coarse hits.
+
+    Scores are full-resolution NCC values (computed on the window, so they
+    may differ from a whole-frame match in the last float bits); only the set
+    of positions examined is narrowed by the coarse pass.
+    """
+    if gray_small.shape[0] < tmpl_small.shape[0] or gray_small.shape[1] < tmpl_small.shape[1]:
+        return []
+    coarse = cv2.matchTemplate(gray_small, tmpl_small, cv2.TM_CCOEFF_NORMED)
+    hits = (coarse >= threshold - COARSE_THRESHOLD_MARGIN).astype(np.uint8)
+    if not hits.any():
+        return []
+
+    th, tw = tmpl.shape[:2]
+    res_h, res_w = image_gray.shape[0] - th + 1, image_gray.shape[1] - tw + 1
+    scale = PYRAMID_SCALE
+    # Grow each hit by one coarse pixel so rounding at the reduced scale
+    # cannot push the true peak outside its window.
+    hits = cv2.dilate(hits, np.ones((3, 3), np.uint8))
+    _, _, stats, _ = cv2.connectedComponentsWithStats(hits, connectivity=8)
+
+    peaks: List[Tuple[int, int, float]] = []
+    for cx, cy, cw, ch, _ in stats[1:].tolist():
+        x0, y0 = cx * scale, cy * scale
+        x1, y1 = min(res_w, (cx + cw) * scale), min(res_h, (cy + ch) * scale)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        window = image_gray[y0:y1 + th - 1, x0:x1 + tw - 1]
+        result = cv2.matchTemplate(window, tmpl, cv2.TM_CCOEFF_NORMED)
+        ys, xs = np.nonzero(result >= threshold)
+        peaks.extend(zip((xs + x0).tolist(), (ys + y0).tolist(), result[ys, xs].tolist()))
+    return peaks
+
+
+def _binary_peaks(
+    code: str,
+    bin_gray: np.ndarray,
+    bin_tmpl: np.ndarray,
+    threshold: float,
+) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+    """BINARY_MATCH detections: score = fraction of agreeing template pixels."""
+    th, tw = bin_tmpl.shape[:2]
+    # On 0/255 images every disagreeing pixel adds exactly 255**2 to SQDIFF.
+    full = 255.0 * 255.0 * th * tw
+    result = cv2.matchTemplate(bin_gray, bin_tmpl, cv2.TM_SQDIFF)
+    ys, xs = np.nonzero(result <= (1.0 - threshold) * full)
+    if not len(ys):
+        return []
+    scores = (1.0 - result[ys, xs] / full).tolist()
+    return [
+        (code, score, (x, y, int(tw), int(th)))
+        for x, y, score in zip(xs.tolist(), ys.tolist(), scores)
+    ]
+
+
+def _result_buffers(res_h: int, res_w: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This thread's reusable (float32 score map, bool mask) pair for one result shape.
+
+    Same-size templates on same-size frames produce the same result shape,
+    so the CPU path reuses these instead of allocating two frame-sized arrays
+    per template. Per-thread because the match pool scores templates
+    concurrently.
+    """
+    local = _result_local
+    shape = (res_h, res_w)
+    if getattr(local, "shape", None) != shape:
+        local.result = np.empty(shape, dtype=np.float32)
+        local.mask = np.empty(shape, dtype=np.bool_)
+        local.shape = shape
+    return local.result, local.mask
+
+
+def _upload_to_gpu(image: np.ndarray) -> Any:
+    mat = cv2.cuda_GpuMat()
+    mat.upload(image)
+    return mat
+
+
+def _cuda_frame_matcher(image_gray: np.ndarray) -> Callable[[Any], np.ndarray]:
+    """
+    Upload image_gray once and return match(gpu_template) -> score map.
+
+    The matcher is shape-independent, so one per thread serves every
+    template; only the (small) score map is downloaded per template.
+    """
+    local = _cuda_local
+    if not hasattr(local, "matcher"):
+        local.matcher = cv2.cuda.createTemplateMatching(cv2.CV_8U, cv2.TM_CCOEFF_NORMED)
+        local.stream = cv2.cuda_Stream()
+        local.frame = cv2.cuda_GpuMat()
+    local.frame.upload(image_gray, stream=local.stream)
+
+    def match(gpu_template: Any) -> np.ndarray:
+        scores = local.matcher.match(local.frame, gpu_template, stream=local.stream)
+        result = scores.download(stream=local.stream)
+        local.stream.waitForCompletion()
+        return result
+
+    return match
+
+
+def _match_pool() -> Optional[ThreadPoolExecutor]:
+    """
+    Shared pool for per-template matching, or None with a single worker.
+
+    cv2.matchTemplate releases the GIL, so templates correlate in parallel.
+    Created on first use; OpenCV's own threading is switched off at that
+    point so the pool and OpenCV do not oversubscribe the cores.
+    """
+    global _MATCH_POOL
+    if MATCH_WORKERS <= 1:
+        return None
+    with _MATCH_POOL_LOCK:
+        if _MATCH_POOL is None:
+            cv2.setNumThreads(1)
+            _MATCH_POOL = ThreadPoolExecutor(max_workers=MATCH_WORKERS, thread_name_prefix="match")
+        return _MATCH_POOL
 
 
 def _match_templates(
     image_gray: np.ndarray,
     threshold: float = 0.8,
+    use_pyramid: Optional[bool] = None,
 ) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
     """
     Run template matching for all loaded card templates.
@@ -128,67 +464,103 @@ def _match_templates(
 
     The 'threshold' parameter controls how strict we are about matches.
     You can tune this later once you have real templates and screenshots.
+    use_pyramid=False forces the exhaustive full-resolution search; None
+    follows PYRAMID_SCALE.
     """
-    detections: List[Tuple[str, float, Tuple[int, int, int, int]]] = []
-
     if not CV2_AVAILABLE:
         return []
 
-    templates = TemplateStore.get_templates()
-    if not templates:
+    codes, imgs = TemplateStore.get_arrays()
+    count = len(codes)
+    if not count:
         return []
 
-    for code, tmpl in templates:
+    gpu_match: Optional[Callable[[Any], np.ndarray]] = None
+    if CUDA_AVAILABLE and len(TemplateStore.gpu_templates) == count:
+        try:
+            gpu_match = _cuda_frame_matcher(np.ascontiguousarray(image_gray))
+        except Exception as exc:  # pragma: no cover - depends on the GPU runtime
+            logger.warning("CUDA template matching failed, using CPU: %s", exc)
+
+    binary_templates = TemplateStore.binary_templates
+    bin_gray: Optional[np.ndarray] = None
+    if BINARY_MATCH and gpu_match is None and len(binary_templates) == count:
+        bin_gray = _binarize(image_gray)
+
+    # The coarse pass only pays off on the CPU path; the GPU scores full frames.
+    small_templates = TemplateStore.small_templates
+    if use_pyramid is None:
+        use_pyramid = PYRAMID_SCALE > 1
+    use_pyramid = (
+        use_pyramid and gpu_match is None and bin_gray is None and PYRAMID_SCALE > 1
+        and len(small_templates) == count
+    )
+    gray_small: Optional[np.ndarray] = None
+    if use_pyramid and any(t is not None for t in small_templates):
+        h, w = image_gray.shape[:2]
+        gray_small = cv2.resize(
+            image_gray, (w // PYRAMID_SCALE, h // PYRAMID_SCALE), interpolation=cv2.INTER_AREA
+        )
+
+    def match_one(idx: int) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+        code, tmpl = codes[idx], imgs[idx]
         th, tw = tmpl.shape[:2]
 
         # Skip if template is larger than the image
         if image_gray.shape[0] < th or image_gray.shape[1] < tw:
-            continue
-
-        result = cv2.matchTemplate(image_gray, tmpl, cv2.TM_CCOEFF_NORMED)
-        ys, xs = np.where(result >= threshold)
-
-        for y, x in zip(ys, xs):
-            score = float(result[y, x])
-            bbox = (int(x), int(y), int(tw), int(th))
-            detections.append((code, score, bbox))
+            return []
+
+        tw, th = int(tw), int(th)
+        if bin_gray is not None:
+            return _binary_peaks(code, bin_gray, binary_templates[idx], threshold)
+
+        if gray_small is not None and small_templates[idx] is not None:
+            peaks = _coarse_to_fine(image_gray, gray_small, tmpl, small_templates[idx], threshold)
+            return [(code, score, (x, y, tw, th)) for x, y, score in peaks]
+
+        nonlocal gpu_match
+        result: Optional[np.ndarray] = None
+        if gpu_match is not None:
+            try:
+                result = gpu_match(TemplateStore.gpu_templates[idx])
+                mask = result >= threshold
+            except cv2.error as exc:
+                # Out of device memory, unsupported size, ...: finish this
+                # frame on the CPU (the GPU path is serial, so this is safe).
+                logger.warning("CUDA template matching failed, using CPU: %s", exc)
+                gpu_match = None
+                result = None
+        if result is None:
+            result, mask = _result_buffers(image_gray.shape[0] - th + 1, image_gray.shape[1] - tw + 1)
+            cv2.matchTemplate(image_gray, tmpl, cv2.TM_CCOEFF_NORMED, result=result)
+            np.greater_equal(result, threshold, out=mask)
+        ys, xs = np.nonzero(mask)
+        if not len(ys):
+            return []
+
+        # Gather scores with one fancy index and convert to Python scalars in
+        # bulk rather than per candidate.
+        scores = result[ys, xs].tolist()
+        return [
+            (code, score, (x, y, tw, th))
+            for x, y, score in zip(xs.tolist(), ys.tolist(), scores)
+        ]
+
+    # GPU matching shares one uploaded frame and stream, so it stays serial.
+    pool = _match_pool() if gpu_match is None and count > 1 else None
+    per_template = pool.map(match_one, range(count)) if pool else map(match_one, range(count))
 
+    detections: List[Tuple[str, float, Tuple[int, int, int, int]]] = []
+    for dets in per_template:
+        detections.extend(dets)
     return detections
 
 
-def _iou(box_a: Tuple[int, int, int, int], box_b: Tuple[int, int, int, int]) -> float:
-    """
-    Compute intersection over union for two bounding boxes.
-
-    Boxes are given as (x, y, w, h).
-    """
-    ax, ay, aw, ah = box_a
-    bx, by, bw, bh = box_b
-
-    ax2, ay2 = ax + aw, ay + ah
-    bx2, by2 = bx + bw, by + bh
-
-    inter_x1 = max(ax, bx)
-    inter_y1 = max(ay, by)
-    inter_x2 = min(ax2, bx2)
-    inter_y2 = min(ay2, by2)
-
-    if inter_x2 <= inter_x1 or inter_y2 <= inter_y1:
-        return 0.0
-
-    inter_area = float(inter_x2 - inter_x1) * float(inter_y2 - inter_y1)
-    area_a = float(aw * ah)
-    area_b = float(bw * bh)
-    union = area_a + area_b - inter_area
-    if union <= 0.0:
-        return 0.0
-
-    return inter_area / union
-
-
 def _nms(
     dets: List[Tuple[str, float, Tuple[int, int, int, int]]],
     iou_threshold: float = 0.3,
+    sigma: Optional[float] = None,
+    score_threshold: float = 0.3,
 ) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
     """
     Non-maximum suppression to remove overlapping detections.
@@ -198,58 +570,217 @@ def _nms(
     Output:
       list of filtered detections, keeping only the highest scoring
       detection for overlapping boxes.
+
+    Boxes are held as NumPy arrays: each round compares the current best box
+    against all remaining ones in a single vector op. A box survives a round
+    while its IoU with the kept box stays strictly below iou_threshold. With
+    numba installed the same greedy pass runs as a compiled double loop
+    (vision/_nms_nb.py).
+
+    With sigma set, Gaussian Soft-NMS runs instead (see _soft_nms) and
+    iou_threshold is not used.
     """
     if not dets:
         return []
+    if sigma is not None:
+        return _soft_nms(dets, sigma, score_threshold)
+    return [dets[k] for k in _nms_keep(dets, iou_threshold)]
 
-    # Sort by score, descending
-    dets_sorted = sorted(dets, key=lambda d: d[1], reverse=True)
-    kept: List[Tuple[str, float, Tuple[int, int, int, int]]] = []
 
-    while dets_sorted:
-        best = dets_sorted.pop(0)
-        kept.append(best)
-        _, _, best_box = best
+def _nms_keep(
+    dets: List[Tuple[str, float, Tuple[int, int, int, int]]],
+    iou_threshold: float = 0.3,
+) -> List[int]:
+    """Indices into dets of the boxes hard NMS keeps, in keep order."""
+    if not dets:
+        return []
+
+    scores = np.fromiter((d[1] for d in dets), dtype=np.float64, count=len(dets))
+    # Highest score first; stable so equal scores keep input order.
+    order = np.argsort(-scores, kind="stable")
+
+    if nms_numba is not None:
+        boxes_i32 = np.array([d[2] for d in dets], dtype=np.int32).reshape(-1, 4)
+        return nms_numba(boxes_i32, order, iou_threshold).tolist()
+
+    boxes = np.array([d[2] for d in dets], dtype=np.float64).reshape(-1, 4)
+    x1, y1 = boxes[:, 0], boxes[:, 1]
+    x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+    areas = boxes[:, 2] * boxes[:, 3]
+
+    keep: List[int] = []
+    while order.size:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        inter_w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        inter_h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        order = rest[iou < iou_threshold]
+
+    return keep
+
+
+def _soft_nms(
+    dets: List[Tuple[str, float, Tuple[int, int, int, int]]],
+    sigma: float,
+    score_threshold: float,
+) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+    """
+    Gaussian Soft-NMS: overlapping boxes are down-weighted, not dropped.
+
+    Each round keeps the highest current score (earliest input on ties) and
+    multiplies every remaining score by exp(-IoU**2 / sigma); boxes whose
+    score falls below score_threshold are discarded. Kept detections carry
+    their decayed score, in keep order. A slightly overlapping neighbour, such
+    as a card on the edge of the next slot, survives with a reduced score,
+    while near-duplicate peaks of the same card decay away.
+    """
+    scores = np.fromiter((d[1] for d in dets), dtype=np.float64, count=len(dets))
+    boxes = np.array([d[2] for d in dets], dtype=np.float64).reshape(-1, 4)
+    x1, y1 = boxes[:, 0], boxes[:, 1]
+    x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+    areas = boxes[:, 2] * boxes[:, 3]
 
-        remaining = []
-        for det in dets_sorted:
-            _, _, box = det
-            if _iou(best_box, box) < iou_threshold:
-                remaining.append(det)
-        dets_sorted = remaining
+    remaining = np.flatnonzero(scores >= score_threshold)
+    kept: List[Tuple[str, float, Tuple[int, int, int, int]]] = []
+    while remaining.size:
+        best = int(np.argmax(scores[remaining]))
+        i = remaining[best]
+        kept.append((dets[i][0], float(scores[i]), dets[i][2]))
+        rest = np.delete(remaining, best)
+        inter_w = np.maximum(0.0, np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]))
+        inter_h = np.maximum(0.0, np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]))
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        scores[rest] *= np.exp(-(iou * iou) / sigma)
+        remaining = rest[scores[rest] >= score_threshold]
 
     return kept
 
 
-def _split_board_and_hero(detections: List[Detection]) -> Tuple[List[str], List[str]]:
+# ((frame key, slots, regions), detections) of the most recent find_cards call. Swapped as one
+# tuple so concurrent worker threads never see a key with another's result.
+_LAST_FRAME: Optional[Tuple[Tuple, List[Detection]]] = None
+
+
+def _frame_key(gray: np.ndarray) -> Tuple:
     """
-    Heuristic split of detections into board and hero rows based on y-position.
+    Fingerprint of the exact grayscale pixels plus the template generation.
 
-    Board is assumed to appear above hero cards. Within each row, detections
-    are sorted by x so the output order is left-to-right.
+    The full frame is hashed rather than a thumbnail: a thumbnail can stay
+    identical while a card corner changes, which would return stale cards.
     """
-    if not detections:
-        return [], []
+    gray = np.ascontiguousarray(gray)
+    return TemplateStore.generation, gray.shape, hashlib.blake2b(gray, digest_size=16).digest()
+
+
+def _config_regions(gray: np.ndarray, config: Optional[Dict[str, Any]]) -> Tuple[Tuple[int, int, int, int], ...]:
+    """Configured card regions clipped to the frame, as (x, y, w, h)."""
+    if not config:
+        return ()
+    frame_h, frame_w = gray.shape[:2]
+    regions = []
+    for key in CARD_REGION_KEYS:
+        region = get_region(config, key)
+        if region is None:
+            continue
+        x, y, w, h = region
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame_w), min(y + h, frame_h)
+        if x1 > x0 and y1 > y0:
+            regions.append((x0, y0, x1 - x0, y1 - y0))
+    return tuple(regions)
 
-    sorted_by_y = sorted(detections, key=lambda d: d[1][1])
-    ys = [bbox[1] for _, bbox in sorted_by_y]
-    median_y = sorted(ys)[len(ys) // 2]
 
-    board, hero = [], []
-    for code, (x, y, w, h) in sorted_by_y:
-        if y <= median_y:
-            board.append((code, (x, y, w, h)))
-        else:
-            hero.append((code, (x, y, w, h)))
+def _match_in_regions(
+    gray: np.ndarray,
+    regions: Tuple[Tuple[int, int, int, int], ...],
+) -> List[Tuple[str, float, Tuple[int, int, int, int]]]:
+    """_match_templates on each region view, with boxes shifted back to frame coordinates."""
+    raw_dets: List[Tuple[str, float, Tuple[int, int, int, int]]] = []
+    for x, y, w, h in regions:
+        for code, score, (bx, by, bw, bh) in _match_templates(gray[y:y + h, x:x + w]):
+            raw_dets.append((code, score, (bx + x, by + y, bw, bh)))
+    return raw_dets
+
+
+def _config_slots(gray: np.ndarray, config: Optional[Dict[str, Any]]) -> Tuple[Tuple[int, int, int, int], ...]:
+    """
+    Card slot rectangles clipped to the frame, or () unless card_slot w/h are set.
+
+    Slots come from the same layout calibration uses to cut templates, so
+    each one holds at most one card.
+    """
+    if not config:
+        return ()
+    slot_cfg = config.get("card_slot") or {}
+    if not (slot_cfg.get("w") and slot_cfg.get("h")):
+        return ()
+    frame_h, frame_w = gray.shape[:2]
+    slots = []
+    for key in CARD_REGION_KEYS:
+        region = get_region(config, key)
+        try:
+            count = int(config.get(CARD_SLOT_COUNT_KEYS[key]) or 0)
+        except (TypeError, ValueError):
+            count = 0
+        if region is None or count <= 0:
+            continue
+        for x, y, w, h in slot_boxes(region, count, slot_cfg):
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + w, frame_w), min(y + h, frame_h)
+            if x1 > x0 and y1 > y0:
+                slots.append((x0, y0, x1 - x0, y1 - y0))
+    return tuple(slots)
 
-    board_sorted = [code for code, bbox in sorted(board, key=lambda d: d[1][0])]
-    hero_sorted = [code for code, bbox in sorted(hero, key=lambda d: d[1][0])]
-    return board_sorted, hero_sorted
 
+def _match_slots(
+    gray: np.ndarray,
+    slots: Tuple[Tuple[int, int, int, int], ...],
+    threshold: float = 0.8,
+) -> List[Detection]:
+    """
+    Best-scoring template per slot, via cv2.minMaxLoc on each slot window.
 
-def find_cards(image: Image.Image) -> List[Detection]:
+    A slot holds at most one card, so there is nothing to suppress: each slot
+    yields its single best match when it clears threshold, and no NMS runs.
     """
-    Detect cards in the given image using template matching.
+    if not CV2_AVAILABLE:
+        return []
+    codes, imgs = TemplateStore.get_arrays()
+    if not codes:
+        return []
+
+    def best_in_slot(slot: Tuple[int, int, int, int]) -> Optional[Detection]:
+        x, y, w, h = slot
+        sub = gray[y:y + h, x:x + w]
+        best: Optional[Detection] = None
+        best_score = threshold
+        for code, tmpl in zip(codes, imgs):
+            th, tw = tmpl.shape[:2]
+            if h < th or w < tw:
+                continue
+            _, score, _, (bx, by) = cv2.minMaxLoc(cv2.matchTemplate(sub, tmpl, cv2.TM_CCOEFF_NORMED))
+            if score >= best_score:
+                best_score = score
+                best = (code, (x + bx, y + by, int(tw), int(th)))
+        return best
+
+    pool = _match_pool() if len(slots) > 1 else None
+    per_slot = pool.map(best_in_slot, slots) if pool else map(best_in_slot, slots)
+    return [det for det in per_slot if det is not None]
+
+
+def find_cards(
+    image: Union[Image.Image, np.ndarray],
+    config: Optional[Dict[str, Any]] = None,
+) -> List[Detection]:
+    """
+    Detect cards in the given image (PIL, RGB or grayscale array) using template matching.
 
     Returns:
       A list of (card_code, (x, y, w, h)) tuples.
@@ -257,16 +788,40 @@ def find_cards(image: Image.Image) -> List[Detection]:
     If no templates are present in data/templates, this function will
     return an empty list. That allows you to run the rest of the pipeline
     before you have card templates ready.
+
+    When config carries hero_region and/or board_region, templates are only
+    correlated inside those regions (boxes are still in frame coordinates);
+    without either region the whole frame is searched. If card_slot w/h are
+    calibrated as well, each of the hero_slots/board_slots slots reports its
+    single best template instead (see _match_slots).
+
+    Calling it again with an identical frame (same pixels) returns the
+    previous detections without re-running template matching.
     """
+    global _LAST_FRAME
     gray = _pil_to_gray(image)
-    raw_dets = _match_templates(gray)
-    nms_dets = _nms(raw_dets)
+    TemplateStore.get_arrays()  # load first so the key has the live generation
+    slots = _config_slots(gray, config)
+    regions = () if slots else _config_regions(gray, config)
+    key = (_frame_key(gray), slots, regions)
+    last = _LAST_FRAME
+    if last is not None and last[0] == key:
+        return list(last[1])
 
     final: List[Detection] = []
-    for code, score, bbox in nms_dets:
-        final.append((code, bbox))
+    if slots:
+        final = _match_slots(gray, slots)
+    else:
+        raw_dets = _match_in_regions(gray, regions) if regions else _match_templates(gray)
+        final = [(raw_dets[k][0], raw_dets[k][2]) for k in _nms_keep(raw_dets)]
+
+    _LAST_FRAME = (key, final)
+    return list(final)
+
 
-    return final
+def _find_and_split(image: Union[Image.Image, np.ndarray]) -> Tuple[List[str], List[str]]:
+    """Detect once and return (board, hero) codes in left-to-right order."""
+    return _split_board_and_hero(find_cards(image))
 
 
 def detect_hole_cards(image: Image.Image) -> List[str]:
@@ -276,8 +831,7 @@ def detect_hole_cards(image: Image.Image) -> List[str]:
     Returns list of codes like ["As", "Kd"] in left-to-right order.
     Uses heuristic row split; refine once table layout is known.
     """
-    detections = find_cards(image)
-    _, hero = _split_board_and_hero(detections)
+    _, hero = _find_and_split(image)
     return hero
 
 
@@ -288,8 +842,7 @@ def detect_board_cards(image: Image.Image) -> List[str]:
     Returns list of 0..5 codes in left-to-right order.
     Uses heuristic row split; refine once table layout is known.
     """
-    detections = find_cards(image)
-    board, _ = _split_board_and_hero(detections)
+    board, _ = _find_and_split(image)
     return board
 
 
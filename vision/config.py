@@ -7,8 +7,10 @@ from __future__ import annotations
 
 import copy
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 DEFAULT_CONFIG_PATH = ROOT_DIR / "data" / "vision_config.json"
@@ -20,6 +22,10 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "stack_region": None,
     "bet_to_call_region": None,
     "action_region": None,
+    # CSS selectors for card elements; when set, cards are read from the DOM
+    # (data-card attribute or a card-<code> class) instead of a screenshot.
+    "hero_selector": None,
+    "board_selector": None,
     "hero_slots": 2,
     "board_slots": 5,
     "card_slot": {
@@ -46,13 +52,24 @@ def _merge_dict(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any
     return base
 
 
-def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
+def _mtime_ns(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
     """
-    Load vision configuration from JSON, overlaying defaults.
+    Parse one version of the config file; mtime_ns is only part of the key.
+
+    The result is shared: load_config deep-copies it, load_config_cached
+    hands it out read-only.
     """
     config = copy.deepcopy(DEFAULT_CONFIG)
-    path = path or DEFAULT_CONFIG_PATH
-    if path.exists():
+    path = Path(path_str)
+    if mtime_ns != -1:
         try:
             with open(path, "r", encoding="utf-8") as handle:
                 data = json.load(handle)
@@ -63,6 +80,31 @@ def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
     return config
 
 
+def _parsed_config(path: Optional[Path]) -> Dict[str, Any]:
+    path = Path(path or DEFAULT_CONFIG_PATH).resolve()
+    return _load_config_cached(str(path), _mtime_ns(path))
+
+
+def load_config(path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load vision configuration from JSON, overlaying defaults.
+
+    The file is parsed once per modification (keyed by st_mtime_ns); each
+    call returns a fresh deep copy that is safe to edit and save.
+    """
+    return copy.deepcopy(_parsed_config(path))
+
+
+def load_config_cached(path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Like load_config, but without the copy.
+
+    Meant for per-frame callers. The returned dict is shared between calls:
+    treat it as read-only and use load_config() for a copy to edit.
+    """
+    return _parsed_config(path)
+
+
 def save_config(config: Dict[str, Any], path: Optional[Path] = None) -> Path:
     """
     Persist vision configuration to JSON.
@@ -71,6 +113,8 @@ def save_config(config: Dict[str, Any], path: Optional[Path] = None) -> Path:
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as handle:
         json.dump(config, handle, indent=2, sort_keys=True)
+    # Writes inside one mtime tick would otherwise look unchanged.
+    _load_config_cached.cache_clear()
     return path
 
 
@@ -91,3 +135,53 @@ def get_region(config: Dict[str, Any], key: str) -> Optional[Tuple[int, int, int
     if w <= 0 or h <= 0:
         return None
     return (x, y, w, h)
+
+
+def slot_boxes(
+    region: Tuple[int, int, int, int],
+    count: int,
+    slot_cfg: Dict[str, Any],
+) -> Tuple[Tuple[int, int, int, int], ...]:
+    """
+    Slot rectangles (x, y, w, h) for count cards laid out left to right in region.
+
+    Uses card_slot w/h/x_spacing when set, otherwise splits region evenly.
+    Memoized, so the result is a tuple; configs holding unhashable values
+    (lists, dicts) are computed uncached.
+    """
+    region = tuple(region)
+    try:
+        return _slot_boxes_cached(region, count, frozenset(slot_cfg.items()))
+    except TypeError:
+        return _slot_boxes_cached.__wrapped__(region, count, tuple(slot_cfg.items()))
+
+
+@lru_cache(maxsize=64)
+def _slot_boxes_cached(
+    region: Tuple[int, int, int, int],
+    count: int,
+    slot_items: FrozenSet[Tuple[str, Any]],
+) -> Tuple[Tuple[int, int, int, int], ...]:
+    slot_cfg = dict(slot_items)
+    x, y, w, h = region
+    slot_w = slot_cfg.get("w")
+    slot_h = slot_cfg.get("h")
+    x_spacing = int(slot_cfg.get("x_spacing", 0) or 0)
+    y_spacing = int(slot_cfg.get("y_spacing", 0) or 0)
+
+    boxes: List[Tuple[int, int, int, int]] = []
+
+    if slot_w and slot_h:
+        cur_x = x
+        for _ in range(count):
+            boxes.append((cur_x, y, int(slot_w), int(slot_h)))
+            cur_x += int(slot_w) + x_spacing
+        return tuple(boxes)
+
+    slot_w = int(w / max(count, 1))
+    slot_h = h
+    for i in range(count):
+        boxes.append((x + i * slot_w, y, slot_w, slot_h))
+    if y_spacing:
+        boxes = [(bx, by + y_spacing, bw, bh - y_spacing) for bx, by, bw, bh in boxes]
+    return tuple(boxes)
@@ -3,8 +3,10 @@
 Wraps common Tesseract configuration and provides small helpers used by
 `capture.py` and `card_reader.py`.
 """
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
 
+import numpy as np
 import pytesseract
 from PIL import Image
 
@@ -16,6 +18,7 @@ DEFAULT_TESS_CONFIG = {
 }
 
 
+@lru_cache(maxsize=64)
 def build_tesseract_config(
     lang: str = DEFAULT_TESS_CONFIG["lang"],
     oem: int = DEFAULT_TESS_CONFIG["oem"],
@@ -25,7 +28,8 @@ def build_tesseract_config(
     """
     Build the Tesseract CLI config string.
 
-    Returns something like: "-l eng --oem 3 --psm 6"
+    Returns something like: "-l eng --oem 3 --psm 6". Memoized, since OCR
+    callers ask for the same few combinations on every read.
     """
     parts = [f"-l {lang}", f"--oem {oem}", f"--psm {psm}"]
     if extra:
@@ -33,21 +37,34 @@ def build_tesseract_config(
     return " ".join(parts)
 
 
+_DEFAULT_CFG = build_tesseract_config()
+
+
 def read_text_from_region(
-    image: Image.Image,
+    image: Union[Image.Image, np.ndarray],
     region: Optional[Tuple[int, int, int, int]] = None,
     config: Optional[str] = None,
 ) -> str:
     """
-    Run OCR on the provided PIL image (optionally cropped to region).
+    Run OCR on the provided image (optionally cropped to region).
 
     Parameters:
-      image  - PIL Image
+      image  - PIL Image or numpy array (H, W[, C]) of the screenshot
       region - optional (x, y, w, h) crop before OCR
       config - optional tesseract config string; if None, uses defaults
+
+    numpy frames are cropped with a slice (a view, no copy) and handed to
+    pytesseract as-is; PIL images are cropped with Image.crop.
     """
-    cfg = config or build_tesseract_config()
-    img = image.crop((region[0], region[1], region[0] + region[2], region[1] + region[3])) if region else image
+    cfg = config or _DEFAULT_CFG
+    if region:
+        x, y, w, h = region
+        if isinstance(image, np.ndarray):
+            img = image[max(y, 0):y + h, max(x, 0):x + w]
+        else:
+            img = image.crop((x, y, x + w, y + h))
+    else:
+        img = image
     try:
         return pytesseract.image_to_string(img, config=cfg)
     except Exception: